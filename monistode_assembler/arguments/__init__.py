@@ -1,5 +1,14 @@
 """The arguments for an assembly command"""
 from .common import Argument, ArgumentParser
 from .matching_parser import MatchingParser
+from .operand_cache import DEFAULT_OPERAND_CACHE_SIZE, OperandCache
+from .signature_trie import SignatureTrie
 
-__all__ = ["Argument", "ArgumentParser", "MatchingParser"]
+__all__ = [
+    "Argument",
+    "ArgumentParser",
+    "DEFAULT_OPERAND_CACHE_SIZE",
+    "MatchingParser",
+    "OperandCache",
+    "SignatureTrie",
+]
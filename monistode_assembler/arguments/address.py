@@ -6,8 +6,12 @@ from monistode_binutils_shared.relocation import SymbolRelocationParams
 
 from ..exceptions import ParserError
 
+_decimal = re.compile(r"\d+")
+_hexadecimal = re.compile(r"0x[\da-fA-F]+")
+_binary = re.compile(r"0b[01]+")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Address:
     """An address argument"""
 
@@ -44,16 +48,36 @@ class AddressParser:
             Address | None: The parsed address, or None if the line does not contain
                 an address
         """
+        scanned = self.scan(line, offset)
+        if scanned is None:
+            return None
+        value, length = scanned
+        return Address(
+            length_in_chars=length,
+            value=value,
+            asint=value,
+            n_bits=self.n_bits,
+        )
+
+    def scan(self, line: str, offset: int) -> tuple[int, int] | None:
+        """Scan an address from the line without creating an argument
+
+        Args:
+            line (str): The line to parse
+            offset (int): The offset to start parsing from
+
+        Returns:
+            tuple[int, int] | None: The value of the address and its length in
+                characters, or None if the line does not contain an address
+        """
         length = self._attempt_scan_decimal(line, offset)
-        if length is not None:
-            return self._parse(line, offset, length)
-        length = self._attempt_scan_hexadecimal(line, offset)
-        if length is not None:
-            return self._parse(line, offset, length)
-        length = self._attempt_scan_binary(line, offset)
-        if length is not None:
-            return self._parse(line, offset, length)
-        return None
+        if length is None:
+            length = self._attempt_scan_hexadecimal(line, offset)
+        if length is None:
+            length = self._attempt_scan_binary(line, offset)
+        if length is None:
+            return None
+        return self._parse(line, offset, length), length
 
     def _attempt_scan_decimal(self, line: str, offset: int) -> int | None:
         """Attempt to scan a decimal address from the line
@@ -66,10 +90,10 @@ class AddressParser:
             int | None: The length of the address in characters, or None if the
                 line does not contain a decimal address
         """
-        result = re.match(r"\d+", line[offset:])
+        result = _decimal.match(line, offset)
         if result is None:
             return None
-        return result.end()
+        return result.end() - offset
 
     def _attempt_scan_hexadecimal(self, line: str, offset: int) -> int | None:
         """Attempt to scan a hexadecimal address from the line
@@ -82,10 +106,10 @@ class AddressParser:
             int | None: The length of the address in characters, or None if the
                 line does not contain a hexadecimal address
         """
-        result = re.match(r"0x[\da-fA-F]+", line[offset:])
+        result = _hexadecimal.match(line, offset)
         if result is None:
             return None
-        return result.end()
+        return result.end() - offset
 
     def _attempt_scan_binary(self, line: str, offset: int) -> int | None:
         """Attempt to scan a binary address from the line
@@ -98,13 +122,13 @@ class AddressParser:
             int | None: The length of the address in characters, or None if the
                 line does not contain a binary address
         """
-        result = re.match(r"0b[01]+", line[offset:])
+        result = _binary.match(line, offset)
         if result is None:
             return None
-        return result.end()
+        return result.end() - offset
 
-    def _parse(self, line: str, offset: int, length: int) -> Address:
-        """Parse an address from the line
+    def _parse(self, line: str, offset: int, length: int) -> int:
+        """Parse the value of an address from the line
 
         Args:
             line (str): The line to parse
@@ -112,7 +136,7 @@ class AddressParser:
             length (int): The length of the address in characters
 
         Returns:
-            Address: The parsed address
+            int: The value of the address
         """
         value = int(line[offset : offset + length], base=0)
         if value >= 2**self.n_bits:
@@ -123,9 +147,4 @@ class AddressParser:
             raise ParserError(
                 f"Address value {value} is too small for {self.n_bits}-bit address"
             )
-        return Address(
-            length_in_chars=length,
-            value=value,
-            asint=value,
-            n_bits=self.n_bits,
-        )
+        return value
@@ -8,8 +8,12 @@ from monistode_binutils_shared.relocation import SymbolRelocationParams
 from ..exceptions import ParserError
 from .label import Label, LabelParser
 
+_decimal = re.compile(r"\d+")
+_hexadecimal = re.compile(r"0x[\da-fA-F]+")
+_binary = re.compile(r"0b[01]+")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Immediate:
     """An immediate argument"""
 
@@ -34,6 +38,7 @@ class ImmediateParser:
             n_bits (int): The number of bits in the immediate
         """
         self.n_bits = n_bits
+        self._label_parser = LabelParser(n_bits)
 
     def attempt_scan(self, line: str, offset: int) -> Immediate | None:
         """Attempt to scan an immediate argument from the line
@@ -82,10 +87,10 @@ class ImmediateParser:
             int | None: The length of the immediate in characters, or None if the
                 line does not contain a decimal immediate
         """
-        result = re.match(r"\d+", line[offset:])
+        result = _decimal.match(line, offset)
         if result is None:
             return None
-        return result.end()
+        return result.end() - offset
 
     def _attempt_scan_hexadecimal(self, line: str, offset: int) -> int | None:
         """Attempt to scan a hexadecimal immediate from the line
@@ -98,10 +103,10 @@ class ImmediateParser:
             int | None: The length of the immediate in characters, or None if the
                 line does not contain a hexadecimal immediate
         """
-        result = re.match(r"0x[\da-fA-F]+", line[offset:])
+        result = _hexadecimal.match(line, offset)
         if result is None:
             return None
-        return result.end()
+        return result.end() - offset
 
     def _attempt_scan_binary(self, line: str, offset: int) -> int | None:
         """Attempt to scan a binary immediate from the line
@@ -114,10 +119,10 @@ class ImmediateParser:
             int | None: The length of the immediate in characters, or None if the
                 line does not contain a binary immediate
         """
-        result = re.match(r"0b[01]+", line[offset:])
+        result = _binary.match(line, offset)
         if result is None:
             return None
-        return result.end()
+        return result.end() - offset
 
     def _attempt_scan_chars(self, line: str, offset: int) -> int | None:
         """Attempt to scan a sequence of characters from the line
@@ -154,7 +159,7 @@ class ImmediateParser:
         Returns:
             Label | None: The label, or None if the line does not contain a label
         """
-        return LabelParser(self.n_bits).attempt_scan(line, offset)
+        return self._label_parser.attempt_scan(line, offset)
 
     def _parse(self, line: str, offset: int, length: int) -> Immediate:
         """Parse an immediate from the line
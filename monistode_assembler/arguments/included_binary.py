@@ -0,0 +1,99 @@
+"""A parser for the file included by an incbin directive"""
+from dataclasses import dataclass, replace
+from functools import cached_property
+import json
+import os
+import re
+
+from monistode_binutils_shared.relocation import SymbolRelocationParams
+
+from ..exceptions import AssemblyError, ParserError
+
+
+@dataclass
+class IncludedBinary:
+    """A slice of a binary file to include in the data section"""
+
+    type_name = "included_binary"
+
+    length_in_chars: int
+    path: str
+    offset: int = 0
+    length: int | None = None
+
+    @cached_property
+    def asbytes(self) -> bytes:
+        """The included slice of the file
+
+        Only the slice is read, into a copy of its own, so the file can
+        change or shrink afterwards without affecting it.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                size = file.seek(0, 2)
+                if self.offset > size:
+                    raise AssemblyError(
+                        f"Offset {self.offset} is past the end of {self.path}"
+                    )
+                end = size if self.length is None else self.offset + self.length
+                if end > size:
+                    raise AssemblyError(
+                        f"Cannot include {end - self.offset} bytes of {self.path} "
+                        f"from offset {self.offset}, it only has {size} bytes"
+                    )
+                file.seek(self.offset)
+                return file.read(end - self.offset)
+        except OSError as error:
+            raise AssemblyError(
+                f"Could not include {self.path}: {error.strerror}"
+            ) from error
+
+    def relative_to(self, directory: str) -> "IncludedBinary":
+        """Resolve a relative path against the given directory"""
+        return replace(self, path=os.path.join(directory, self.path))
+
+    @property
+    def symbols(self) -> tuple[SymbolRelocationParams, ...]:
+        """The symbols in the argument"""
+        return ()
+
+
+class IncludedBinaryParser:
+    """A parser for a path, optionally followed by an offset and a length"""
+
+    type_name = "included_binary"
+
+    _number = re.compile(r"\s*,\s*(0x[\da-fA-F]+|\d+)")
+
+    def attempt_scan(self, line: str, offset: int) -> IncludedBinary | None:
+        """Attempt to scan the argument from the line
+
+        Args:
+            line (str): The line to scan
+            offset (int): The offset to start scanning from
+        """
+        if offset >= len(line) or line[offset] != '"':
+            return None
+        end = offset + 1
+        while end < len(line):
+            if line[end] == '"':
+                break
+            if line[end] == "\\":
+                end += 1
+            end += 1
+        if end >= len(line):
+            return None
+        end += 1
+        try:
+            path = json.loads(line[offset:end])
+        except ValueError as error:
+            raise ParserError(f"Invalid path {line[offset:end]}: {error}") from error
+        numbers: list[int] = []
+        while len(numbers) < 2:
+            result = self._number.match(line, end)
+            if result is None:
+                break
+            number = result.group(1)
+            numbers.append(int(number, 16 if number.startswith("0x") else 10))
+            end = result.end()
+        return IncludedBinary(end - offset, path, *numbers)
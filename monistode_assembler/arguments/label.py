@@ -9,8 +9,13 @@ from monistode_binutils_shared.relocation import (
 
 from .address import AddressParser
 
+_absolute = re.compile(r"ABSOLUTE\s+")
+_offset = re.compile(r"OFFSET\s+")
+_label = re.compile(r"([a-zA-Z_][a-zA-Z0-9_]*)(?:\s|,)?")
+_plus = re.compile(r"\s*\+\s*")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Label:
     """A label in the text section"""
 
@@ -38,6 +43,7 @@ class LabelParser:
         """
         self.n_bits = n_bits
         self.relative = relative
+        self._address_parser = AddressParser(n_bits)
 
     def attempt_scan(self, line: str, offset: int) -> Label | None:
         """Attempt to scan a label from the line, taking into account the
@@ -50,15 +56,17 @@ class LabelParser:
         Returns:
             Label | None: The parsed label, or None if no label was found
         """
-        match = re.match(r"ABSOLUTE\s+", line[offset:])
+        start = offset
+        relative = self.relative
+        match = _absolute.match(line, offset)
         if match is not None:
-            offset += match.end()
-            self.relative = False
-        match = re.match(r"OFFSET\s+", line[offset:])
+            offset = match.end()
+            relative = False
+        match = _offset.match(line, offset)
         if match is not None:
-            offset += match.end()
-            self.relative = True
-        return self.attempt_scan_label(line, offset)
+            offset = match.end()
+            relative = True
+        return self._scan_label(line, start, offset, relative)
 
     def attempt_scan_label(self, line: str, offset: int) -> Label | None:
         """Attempt to scan a label from the line
@@ -67,27 +75,43 @@ class LabelParser:
             line (str): The line to parse
             offset (int): The offset to start parsing from
 
+        Returns:
+            Label | None: The parsed label, or None if no label was found
+        """
+        return self._scan_label(line, offset, offset, self.relative)
+
+    def _scan_label(
+        self, line: str, start: int, offset: int, relative: bool
+    ) -> Label | None:
+        """Scan a label from the line
+
+        Args:
+            line (str): The line to parse
+            start (int): The offset the argument starts at, before any directive
+            offset (int): The offset the name of the label starts at
+            relative (bool): Whether the address is relative to the current address
+
         Returns:
             Label | None: The parsed label, or None if no label was found
         """
         # detect all ascii followed by either whitespace, a plus sign or a comma
-        match = re.match(r"([a-zA-Z_][a-zA-Z0-9_]*)(?:\s|,)?", line[offset:])
+        match = _label.match(line, offset)
         if match is None:
             return None
-        offset, n_offset_chars = self.attempt_scan_offset(line, offset + match.end())
+        address, n_offset_chars = self.attempt_scan_offset(line, match.end())
         return Label(
-            length_in_chars=match.end() + n_offset_chars,
+            length_in_chars=match.end() - start + n_offset_chars,
             n_bits=self.n_bits,
             symbols=(
                 SymbolRelocationParams(
                     RelocationTargetSymbol(match.group(1)),
                     size=16,
                     offset=0,
-                    relative=self.relative,
+                    relative=relative,
                 ),
             ),
-            value=offset,
-            asint=offset,
+            value=address,
+            asint=address,
         )
 
     def attempt_scan_offset(self, line: str, offset: int) -> tuple[int, int]:
@@ -101,12 +125,12 @@ class LabelParser:
             int: The offset of the label and the number of characters parsed
         """
         # First we find a plus literal and all the whitespace after it
-        match = re.match(r"^\s*\+\s*", line[offset:])
+        match = _plus.match(line, offset)
         if match is None:
             return 0, 0
         # Then we find the address
-        address_parser = AddressParser(self.n_bits)
-        address = address_parser.attempt_scan(line, offset + match.end())
+        address = self._address_parser.scan(line, match.end())
         if address is None:
             return 0, 0
-        return address.asint, match.end() + address.length_in_chars
+        value, length = address
+        return value, match.end() - offset + length
@@ -3,27 +3,51 @@
 import re
 
 from ..exceptions import ParserError
-from .common import Argument, ArgumentParser
+from .common import Argument
+from .operand_cache import OperandCache
+from .signature_trie import SignatureTrie
 
 
 class MatchingParser:
     """A parser for a sequence of arguments that tries to match a signature."""
 
+    _delimiters = re.compile(r"[\s,]*")
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        # The results of the argument parsers run by the last parse, by parser
+        # identity and offset, kept for instrumentation
+        self.last_scans: dict[tuple[int, int], Argument | None] = {}
+
     def parse(
-        self, line: str, signatures: tuple[tuple[ArgumentParser, ...], ...]
+        self,
+        line: str,
+        signatures: SignatureTrie,
+        offset: int = 0,
+        cache: OperandCache | None = None,
     ) -> tuple[Argument, ...]:
         """Parse the arguments from the line
 
+        The signatures are matched operand by operand along the trie, and every
+        parser is run at most once per offset, however many signatures use it.
+
         Args:
             line (str): The line to parse
+            signatures (SignatureTrie): The signatures to try to match
             offset (int): The offset to start parsing from
+            cache (OperandCache | None): A cache of earlier scans to consult
+                before running a parser; a cache of size zero is not used
 
         Raises:
             ParseError: If the line does not match any of the signatures
                 or matches multiple signatures
         """
-        runs = [self._parse(line, signature) for signature in signatures]
-        candidates = [candidate for candidate in runs if candidate is not None]
+        if cache is not None and cache.max_size <= 0:
+            # A disabled cache would only slice the line and count misses
+            cache = None
+        candidates: list[tuple[Argument, ...]] = []
+        self.last_scans = {}
+        self._parse(line, signatures, offset, (), self.last_scans, candidates, cache)
         if len(candidates) == 0:
             raise ParserError("Could not parse arguments: no matching signature")
         if len(candidates) > 1:
@@ -37,35 +61,56 @@ class MatchingParser:
         return candidates[0]
 
     def _parse(
-        self, line: str, signature: tuple[ArgumentParser, ...]
-    ) -> tuple[Argument, ...] | None:
-        """Parse the arguments from the line
+        self,
+        line: str,
+        node: SignatureTrie,
+        offset: int,
+        arguments: tuple[Argument, ...],
+        scans: dict[tuple[int, int], Argument | None],
+        candidates: list[tuple[Argument, ...]],
+        cache: OperandCache | None,
+    ) -> None:
+        """Parse the remaining arguments from the line
 
         Args:
             line (str): The line to parse
-            signature (tuple[ArgumentParser, ...]): The signature to match
-
-        Returns:
-            tuple[Argument, ...] | None: The parsed arguments, or None if the line
-                does not match the signature
+            node (SignatureTrie): The signatures that start with the arguments
+                parsed so far
+            offset (int): The offset to continue parsing from
+            arguments (tuple[Argument, ...]): The arguments parsed so far
+            scans (dict[tuple[int, int], Argument | None]): The results of the
+                scans so far, by parser identity and offset
+            candidates (list[tuple[Argument, ...]]): The list to add complete
+                matches to
+            cache (OperandCache | None): A cache of earlier scans, if any
         """
-        offset = 0
-        arguments = []
-        for parser in signature:
-            offset = self._skip_delimiters(line, offset)
-            argument = parser.attempt_scan(line, offset)
-            if argument is None:
-                return None
-            arguments.append(argument)
-            offset += argument.length_in_chars
         offset = self._skip_delimiters(line, offset)
-        if offset < len(line) and line[offset] != "#":
-            return None
-        return tuple(arguments)
+        if node.terminal and (offset >= len(line) or line[offset] == "#"):
+            candidates.append(arguments)
+        rest = line[offset:] if cache is not None and node.children else ""
+        for parser, child in node.children.values():
+            key = (id(parser), offset)
+            if key in scans:
+                argument = scans[key]
+            elif cache is not None:
+                argument = scans[key] = cache.scan(parser, rest)
+            else:
+                argument = scans[key] = parser.attempt_scan(line, offset)
+            if argument is None:
+                continue
+            self._parse(
+                line,
+                child,
+                offset + argument.length_in_chars,
+                arguments + (argument,),
+                scans,
+                candidates,
+                cache,
+            )
 
     def _skip_delimiters(self, line: str, offset: int) -> int:
         """Skip leading delimiters in a line of source code."""
-        result = re.search(r"[^\s,]", line[offset:])
+        result = self._delimiters.match(line, offset)
         if result is None:
             return offset
-        return result.start() + offset
+        return result.end()
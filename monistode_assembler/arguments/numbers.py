@@ -0,0 +1,179 @@
+"""Parsers for the numeric arguments of data directives"""
+from dataclasses import dataclass
+import re
+from typing import Sequence
+
+from monistode_binutils_shared.relocation import SymbolRelocationParams
+
+from ..exceptions import ParserError
+from ..packing import split_bytes
+
+_number = r"-?(?:0x[\da-fA-F]+|0b[01]+|[1-9]\d*|0)"
+_numbers = re.compile(rf"{_number}(?:\s*,\s*{_number})*")
+_number_values = re.compile(_number)
+
+
+def scan_numbers(line: str, offset: int) -> tuple[list[int], int] | None:
+    """Scan a comma-separated list of numbers in a single pass
+
+    Args:
+        line (str): The line to scan
+        offset (int): The offset to start scanning from
+
+    Returns:
+        tuple[list[int], int] | None: The numbers and the offset just past them,
+            or None if the line does not contain a number at the offset
+    """
+    result = _numbers.match(line, offset)
+    if result is None:
+        return None
+    return [
+        int(number, 0) for number in _number_values.findall(result.group())
+    ], result.end()
+
+
+def encode_numbers(values: Sequence[int], size: int, byte: int) -> Sequence[int]:
+    """Encode numbers as big-endian groups of bytes
+
+    Args:
+        values (Sequence[int]): The numbers to encode
+        size (int): The number of bytes to encode each number as
+        byte (int): The width of a byte in bits
+
+    Returns:
+        Sequence[int]: The bytes of the numbers
+    """
+    mask = (1 << size * byte) - 1
+    if byte == 8:
+        return b"".join((value & mask).to_bytes(size, "big") for value in values)
+    encoded: list[int] = []
+    for value in values:
+        encoded.extend(split_bytes(value & mask, byte, size))
+    return encoded
+
+
+def check_range(values: Sequence[int], size: int, byte: int) -> None:
+    """Check that numbers fit in the given number of bytes, signed or unsigned
+
+    Raises:
+        ParserError: If a number does not fit
+    """
+    bits = size * byte
+    largest, smallest = max(values, default=0), min(values, default=0)
+    if largest >= 1 << bits:
+        raise ParserError(f"Value {largest} does not fit in {bits} bits")
+    if smallest < -(1 << bits - 1):
+        raise ParserError(f"Value {smallest} does not fit in {bits} bits")
+
+
+@dataclass
+class Numbers:
+    """A list of numbers of the same size"""
+
+    type_name = "numbers"
+
+    length_in_chars: int
+    values: list[int]
+    size: int
+    byte: int
+
+    @property
+    def asbytes(self) -> Sequence[int]:
+        """The argument as bytes"""
+        return encode_numbers(self.values, self.size, self.byte)
+
+    @property
+    def symbols(self) -> tuple[SymbolRelocationParams, ...]:
+        """The symbols in the argument"""
+        return ()
+
+
+class NumbersParser:
+    """A parser for a comma-separated list of numbers of the same size"""
+
+    type_name = "numbers"
+
+    def __init__(self, size: int, byte: int) -> None:
+        """Initialize the parser
+
+        Args:
+            size (int): The number of bytes in each number
+            byte (int): The width of a byte in bits
+        """
+        self.size = size
+        self.byte = byte
+
+    def attempt_scan(self, line: str, offset: int) -> Numbers | None:
+        """Attempt to scan the argument from the line
+
+        Args:
+            line (str): The line to scan
+            offset (int): The offset to start scanning from
+        """
+        scanned = scan_numbers(line, offset)
+        if scanned is None:
+            return None
+        values, end = scanned
+        check_range(values, self.size, self.byte)
+        return Numbers(end - offset, values, self.size, self.byte)
+
+
+@dataclass
+class Fill:
+    """A number repeated a number of times"""
+
+    type_name = "fill"
+
+    length_in_chars: int
+    count: int
+    size: int
+    value: int
+    byte: int
+
+    @property
+    def asbytes(self) -> Sequence[int]:
+        """The argument as bytes"""
+        return encode_numbers((self.value,), self.size, self.byte) * self.count
+
+    @property
+    def symbols(self) -> tuple[SymbolRelocationParams, ...]:
+        """The symbols in the argument"""
+        return ()
+
+
+class FillParser:
+    """A parser for a count, optionally followed by a size and a value"""
+
+    type_name = "fill"
+
+    def __init__(self, byte: int, count_only: bool = False) -> None:
+        """Initialize the parser
+
+        Args:
+            byte (int): The width of a byte in bits
+            count_only (bool): Whether to only accept a count, filling
+                that many bytes with zeros
+        """
+        self.byte = byte
+        self.count_only = count_only
+
+    def attempt_scan(self, line: str, offset: int) -> Fill | None:
+        """Attempt to scan the argument from the line
+
+        Args:
+            line (str): The line to scan
+            offset (int): The offset to start scanning from
+        """
+        scanned = scan_numbers(line, offset)
+        if scanned is None:
+            return None
+        values, end = scanned
+        if len(values) > (1 if self.count_only else 3):
+            return None
+        count, size, value = values + [1, 0][len(values) - 1 :]
+        if count < 0:
+            raise ParserError(f"Cannot fill a negative number of times: {count}")
+        if size < 1:
+            raise ParserError(f"Cannot fill with values of {size} bytes")
+        check_range((value,), size, self.byte)
+        return Fill(end - offset, count, size, value, self.byte)
@@ -0,0 +1,74 @@
+"""A bounded cache of scanned operands."""
+from collections import OrderedDict
+
+from .common import Argument, ArgumentParser
+
+DEFAULT_OPERAND_CACHE_SIZE = 4096
+
+
+class OperandCache:
+    """A least-recently-used cache of the results of argument parsers.
+
+    A parser's result depends only on the parser and the rest of the line
+    from the offset it starts at, so results are keyed on both. The cached
+    arguments are shared between lines and must not be modified. Errors
+    raised by a parser are not cached, so they are raised again, with the
+    line they occurred on, every time.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_OPERAND_CACHE_SIZE) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size: The number of results to keep; a size of zero
+                disables the cache.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[
+            tuple[ArgumentParser[Argument], str], Argument | None
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of cached results."""
+        return len(self._results)
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of scans answered from the cache."""
+        scans = self.hits + self.misses
+        return self.hits / scans if scans else 0
+
+    def scan(self, parser: ArgumentParser[Argument], rest: str) -> Argument | None:
+        """Scan an operand, or get the result of an identical earlier scan.
+
+        Args:
+            parser: The parser to scan with.
+            rest: The rest of the line, starting at the operand.
+
+        Returns:
+            The scanned argument, or None if the parser did not match.
+        """
+        key = (parser, rest)
+        try:
+            argument = self._results[key]
+        except KeyError:
+            pass
+        else:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return argument
+        self.misses += 1
+        argument = parser.attempt_scan(rest, 0)
+        if self.max_size > 0:
+            self._results[key] = argument
+            if len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return argument
+
+    def clear(self) -> None:
+        """Forget every cached result and reset the counters."""
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
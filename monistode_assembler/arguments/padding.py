@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from monistode_binutils_shared.relocation import SymbolRelocationParams
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Padding:
     """A padding pseudo-argument"""
 
@@ -28,6 +28,8 @@ class PaddingParser:
             n_bits (int): The number of bits in the padding
         """
         self.n_bits = n_bits
+        # Padding matches anywhere and always scans to the same argument
+        self._padding = Padding(n_bits)
 
     def attempt_scan(self, line: str, offset: int) -> Padding | None:
         """Attempt to scan a padding argument from the line
@@ -40,4 +42,4 @@ class PaddingParser:
             Padding | None: The parsed padding, or None if the line does not
                 contain a padding
         """
-        return Padding(self.n_bits)
+        return self._padding
@@ -9,8 +9,10 @@ from monistode_binutils_shared.relocation import SymbolRelocationParams
 if TYPE_CHECKING:
     from monistode_assembler.description import RegisterGroup
 
+_register_name = re.compile(r"[a-zA-Z0-9]+")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Register:
     """A register"""
 
@@ -32,15 +34,7 @@ class RegisterParser:
             group (RegisterGroup): The register group to parse from
         """
         self.group = group
-
-    @property
-    def type_name(self) -> str:
-        registers = sorted(
-            self.group.registers
-            if isinstance(self.group.registers, list)
-            else list(self.group.registers.keys())
-        )
-        return f"{'|'.join(registers)} register"
+        self.type_name = f"{group.names} register"
 
     def attempt_scan(self, line: str, offset: int) -> Register | None:
         """Attempt to scan an immediate argument from the line
@@ -52,20 +46,36 @@ class RegisterParser:
         Returns:
             Immediate | None: The parsed immediate, or None if the line does not
         """
-        if offset >= len(line) or line[offset] != "%":
-            return None
-        offset += 1
-        match = re.match(r"[a-zA-Z0-9]+", line[offset:])
-        if match is None:
-            return None
-        register_name = match.group(0)
-        register_index = self.group.get_register_index(register_name)
-        if register_index is None:
+        scanned = self.scan(line, offset)
+        if scanned is None:
             return None
+        register_index, length = scanned
         return Register(
             type_name=self.type_name,
-            length_in_chars=len(register_name) + 1,
+            length_in_chars=length,
             value=register_index,
             asint=register_index,
             n_bits=self.group.length,
         )
+
+    def scan(self, line: str, offset: int) -> tuple[int, int] | None:
+        """Scan a register from the line without creating an argument
+
+        Args:
+            line (str): The line to parse
+            offset (int): The offset to start parsing from
+
+        Returns:
+            tuple[int, int] | None: The index of the register and its length
+                in characters, or None if the line does not contain a register
+                of the group
+        """
+        if offset >= len(line) or line[offset] != "%":
+            return None
+        match = _register_name.match(line, offset + 1)
+        if match is None:
+            return None
+        register_index = self.group.get_register_index(match.group(0))
+        if register_index is None:
+            return None
+        return register_index, match.end() - offset
@@ -11,7 +11,7 @@ if TYPE_CHECKING:
     from monistode_assembler.description import RegisterGroup
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RegisterAddress:
     """An addressation by register"""
 
@@ -33,15 +33,8 @@ class RegisterAddressParser:
             group (RegisterGroup): The register group to parse from
         """
         self.group = group
-
-    @property
-    def type_name(self) -> str:
-        registers = sorted(
-            self.group.registers
-            if isinstance(self.group.registers, list)
-            else list(self.group.registers.keys())
-        )
-        return f"{'|'.join(registers)} register_address"
+        self.type_name = f"{group.names} register_address"
+        self._register_parser = RegisterParser(group)
 
     def attempt_scan(self, line: str, offset: int) -> RegisterAddress | None:
         """Attempt to scan a register address from the line
@@ -55,18 +48,18 @@ class RegisterAddressParser:
         """
         if offset >= len(line) or line[offset] != "[":
             return None
-        register = RegisterParser(self.group).attempt_scan(line, offset + 1)
-        if register is None:
+        scanned = self._register_parser.scan(line, offset + 1)
+        if scanned is None:
             return None
-        if register.length_in_chars + 1 + offset >= len(line):
+        register, length = scanned
+        if length + 1 + offset >= len(line):
             return None
-        if line[register.length_in_chars + 1 + offset] != "]":
+        if line[length + 1 + offset] != "]":
             return None
         return RegisterAddress(
             self.type_name,
-            register.length_in_chars + 2,
-            register.value,
-            register.asint,
-            register.n_bits,
-            register.symbols,
+            length + 2,
+            register,
+            register,
+            self.group.length,
         )
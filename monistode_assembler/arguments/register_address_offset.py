@@ -11,7 +11,7 @@ if TYPE_CHECKING:
     from monistode_assembler.description import RegisterGroup
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RegisterAddressOffset:
     """An addressation by register with an offset"""
 
@@ -39,18 +39,13 @@ class RegisterAddressOffsetParser:
             relative (bool): Whether the offset is absolute or relative
         """
         self.group = group
+        self.type_name = f"{group.names} register_address_offset"
         self.padding_bits = padding_bits
         self.offset_bits = offset_bits
         self.relative = relative
-
-    @property
-    def type_name(self) -> str:
-        registers = sorted(
-            self.group.registers
-            if isinstance(self.group.registers, list)
-            else list(self.group.registers.keys())
+        self._register_offset_parser = RegisterOffsetParser(
+            group, padding_bits, offset_bits, relative
         )
-        return f"{'|'.join(registers)} register_address_offset"
 
     def attempt_scan(self, line: str, offset: int) -> RegisterAddressOffset | None:
         """Attempt to scan a register address from the line
@@ -66,9 +61,9 @@ class RegisterAddressOffsetParser:
             return None
         offset += 1
 
-        register_address_offset = RegisterOffsetParser(
-            self.group, self.padding_bits, self.offset_bits, self.relative
-        ).attempt_scan(line, offset)
+        register_address_offset = self._register_offset_parser.attempt_scan(
+            line, offset
+        )
         if register_address_offset is None:
             return None
         offset += register_address_offset.length_in_chars
@@ -6,15 +6,17 @@ from typing import TYPE_CHECKING
 
 from monistode_binutils_shared.relocation import SymbolRelocationParams
 
-from .address import Address, AddressParser
-from .label import Label, LabelParser
+from .address import AddressParser
+from .label import LabelParser
 from .regiser import RegisterParser
 
 if TYPE_CHECKING:
     from monistode_assembler.description import RegisterGroup
 
+_plus = re.compile(r"\s*\+\s*")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class RegisterOffset:
     """An register with an offset"""
 
@@ -48,6 +50,9 @@ class RegisterOffsetParser:
         self.padding_bits = padding_bits
         self.offset_bits = offset_bits
         self.relative = relative
+        self._register_parser = RegisterParser(group)
+        self._label_parser = LabelParser(offset_bits, relative)
+        self._address_parser = AddressParser(offset_bits)
 
     def attempt_scan(self, line: str, offset: int) -> RegisterOffset | None:
         """Attempt to scan a register address from the line
@@ -59,39 +64,43 @@ class RegisterOffsetParser:
         Returns:
             RegisterAddressOffset | None: The parsed addressation, or None if no label was found
         """
-        register = RegisterParser(self.group).attempt_scan(line, offset)
-        if register is None:
+        scanned = self._register_parser.scan(line, offset)
+        if scanned is None:
             return None
-        offset += register.length_in_chars
+        register, register_length = scanned
+        offset += register_length
 
         plus_sign_len = self._scan_plus_sign(line, offset)
         if plus_sign_len is None:
             return None
         offset += plus_sign_len
 
-        address: Address | Label | None = LabelParser(
-            self.offset_bits, self.relative
-        ).attempt_scan(line, offset)
-        if address is None:
-            address = AddressParser(self.offset_bits).attempt_scan(line, offset)
-        if address is None:
-            return None
-        offset += address.length_in_chars
-
+        symbols: tuple[SymbolRelocationParams, ...] = ()
+        label = self._label_parser.attempt_scan(line, offset)
+        if label is not None:
+            address, address_length = label.asint, label.length_in_chars
+            symbols = label.symbols
+        else:
+            scanned = self._address_parser.scan(line, offset)
+            if scanned is None:
+                return None
+            address, address_length = scanned
+
+        register_bits = self.group.length
         return RegisterOffset(
-            register.length_in_chars + plus_sign_len + address.length_in_chars,
-            address.asint,
-            register.asint,
-            register.asint << (self.padding_bits + self.offset_bits) | address.asint,
-            self.padding_bits + self.offset_bits + register.n_bits,
+            register_length + plus_sign_len + address_length,
+            address,
+            register,
+            register << (self.padding_bits + self.offset_bits) | address,
+            self.padding_bits + self.offset_bits + register_bits,
             tuple(
                 SymbolRelocationParams(
                     symbol.target,
                     symbol.size,
-                    symbol.offset + self.padding_bits + register.n_bits,
+                    symbol.offset + self.padding_bits + register_bits,
                     symbol.relative,
                 )
-                for symbol in address.symbols
+                for symbol in symbols
             ),
         )
 
@@ -105,7 +114,7 @@ class RegisterOffsetParser:
         Returns:
             int | None: The offset after the plus sign, or None if no plus sign was found
         """
-        match = re.match(r"\s*\+\s*", line[offset:])
+        match = _plus.match(line, offset)
         if match is None:
             return None
-        return match.end()
+        return match.end() - offset
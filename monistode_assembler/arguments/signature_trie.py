@@ -0,0 +1,41 @@
+"""A prefix tree of argument signatures."""
+from typing import Generic, Iterable, TypeVar
+
+from .common import Argument, ArgumentParser
+
+T = TypeVar("T", bound=Argument)
+
+
+class SignatureTrie(Generic[T]):
+    """A prefix tree of argument signatures.
+
+    Signatures that start with the same argument parsers share the nodes for
+    them, so a matcher only has to scan each of those operands once.
+    """
+
+    def __init__(
+        self, signatures: Iterable[tuple[ArgumentParser[T], ...]] = ()
+    ) -> None:
+        """Initialize the trie
+
+        Args:
+            signatures (Iterable[tuple[ArgumentParser[T], ...]]): The signatures
+                to add to the trie
+        """
+        self.children: dict[int, tuple[ArgumentParser[T], SignatureTrie[T]]] = {}
+        self.terminal = False
+        for signature in signatures:
+            self.add(signature)
+
+    def add(self, signature: tuple[ArgumentParser[T], ...]) -> None:
+        """Add a signature to the trie
+
+        Args:
+            signature (tuple[ArgumentParser[T], ...]): The signature to add
+        """
+        node = self
+        for parser in signature:
+            if id(parser) not in node.children:
+                node.children[id(parser)] = (parser, SignatureTrie())
+            node = node.children[id(parser)][1]
+        node.terminal = True
@@ -1,60 +1,71 @@
 """Assemble a program into an object file."""
-import itertools
-from typing import Iterator
+from contextlib import closing
+from typing import Iterable, Iterator
 
-from monistode_binutils_shared import ObjectManager, ObjectParameters
+from monistode_binutils_shared import ObjectManager, ObjectParameters, Section
 
+from monistode_assembler.arguments import DEFAULT_OPERAND_CACHE_SIZE, OperandCache
 from monistode_assembler.arguments.common import ArgumentParser
 from monistode_assembler.command_description import ConfigurationCommand
-from monistode_assembler.sections.common import SectionParser
-from monistode_assembler.sections.data import DataSectionParameters, DataSectionParser
-from monistode_assembler.sections.text import (
-    CommandDefinition,
-    TextSectionParameters,
-    TextSectionParser,
+from monistode_assembler.compiled import (
+    CompiledConfiguration,
+    expand_commands,
+    signatures_for,
 )
+from monistode_assembler.sections.text import CommandDefinition
 from monistode_assembler.sections.text_argument import TextArgument
 
 from .description import Configuration
-from .parse import Parser
+from .exceptions import AssemblerErrors
+from .parallel import DEFAULT_CHUNK_LINES, encode_parallel
+from .parse import LineCache, Parser, source_lines
+from .stats import AssemblyHooks, InstrumentedParser
 
 
 class Assembler:
-    """An assembler for monistode assembly language source files."""
+    """An assembler for monistode assembly language source files.
 
-    def __init__(self, configuration: Configuration) -> None:
-        """Initialize the assembler."""
+    The compiled tables of the ISA, the encoding templates and the operand
+    cache are built once and kept; everything that belongs to a single
+    source file lives in a parser created for it. An assembler can thus
+    assemble any number of sources one after another, each as if it were
+    the only one. It is not meant to be used by several threads at once.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        commands: list[CommandDefinition] | None = None,
+        line_cache: LineCache | None = None,
+        keep_going: bool = False,
+        hooks: AssemblyHooks | None = None,
+        operand_cache_size: int = DEFAULT_OPERAND_CACHE_SIZE,
+    ) -> None:
+        """Initialize the assembler.
+
+        Args:
+            configuration: The description of the ISA.
+            commands: The expanded command table of the configuration,
+                if it was already compiled.
+            line_cache: Lines encoded by a previous assembly to re-use.
+            keep_going: Whether to skip lines with errors and report all
+                of them at the end, instead of stopping at the first one.
+            hooks: Hooks to report the phases of the assembly to.
+            operand_cache_size: The number of scanned operands to keep for
+                re-use by later lines; zero disables the cache.
+        """
+        self._keep_going = keep_going
+        self._hooks = AssemblyHooks() if hooks is None else hooks
         self._configuration = configuration
-        section_parsers: list[SectionParser] = [
-            TextSectionParser(
-                parameters=TextSectionParameters(
-                    byte=configuration.text_byte_length,
-                    opcode_offset=configuration.opcode_offset,
-                    opcode_length=configuration.opcode_length,
-                    text_address_bits=configuration.text_address_size,
-                    data_address_bits=configuration.data_address_size,
-                ),
-                commands=[
-                    CommandDefinition(
-                        mnemonic=command.mnemonic,
-                        opcode=command.opcode,
-                        arguments=signature,
-                        pre_opcode_arguments=command.get_n_pre_opcode_arguments(
-                            configuration.opcode_offset, configuration
-                        ),
-                    )
-                    for command in configuration.commands
-                    for signature in self.signatures_for(command)
-                ],
-            ),
-            DataSectionParser(
-                parameters=DataSectionParameters(
-                    byte=configuration.data_byte_length,
-                    data_address_bits=configuration.data_address_size,
-                )
-            ),
-        ]
-        self._parser = Parser(section_parsers)
+        if commands is None:
+            with self._hooks.timed("expand_commands"):
+                commands = expand_commands(configuration)
+        self._compiled = CompiledConfiguration(configuration, commands)
+        with self._hooks.timed("section_parsers"):
+            self._section_parsers = self._compiled.section_parsers()
+        self._line_cache = line_cache
+        self._operand_cache = OperandCache(operand_cache_size)
+        self._instrumented = hooks is not None
         self._object_parameters = ObjectParameters(
             opcode_size=configuration.opcode_length,
             text_byte=configuration.text_byte_length,
@@ -62,7 +73,25 @@ class Assembler:
             text_address=configuration.text_address_size,
             data_address=configuration.data_address_size,
         )
-        self._manager = ObjectManager(self._object_parameters)
+
+    @classmethod
+    def from_compiled(
+        cls,
+        compiled: CompiledConfiguration,
+        line_cache: LineCache | None = None,
+        keep_going: bool = False,
+        hooks: AssemblyHooks | None = None,
+        operand_cache_size: int = DEFAULT_OPERAND_CACHE_SIZE,
+    ) -> "Assembler":
+        """Initialize an assembler from a compiled configuration."""
+        return cls(
+            compiled.configuration,
+            compiled.commands,
+            line_cache,
+            keep_going,
+            hooks,
+            operand_cache_size,
+        )
 
     def signatures_for(
         self, command: ConfigurationCommand
@@ -76,17 +105,98 @@ class Assembler:
             tuple[ArgumentParser[TextArgument], ...]: The signature,
                 as a tuple of argument parsers
         """
-        for signature in itertools.product(
-            *(
-                argument.get_parsers(self._configuration)
-                for argument in command.arguments
+        yield from signatures_for(command, self._configuration)
+
+    def assemble(self, source: str | Iterable[str], directory: str = "") -> bytes:
+        """Assemble a program from a source file.
+
+        Args:
+            source: The source code, either as a whole or as an iterable of
+                lines (such as an open file), which is consumed lazily.
+            directory: The directory of the source file, which the paths in
+                it are relative to; defaults to the working directory.
+
+        Raises:
+            AssemblerErrors: If the assembler keeps going after errors,
+                with every error that occurred.
+        """
+        parser = self._start_job(directory)
+        hits, misses = self._operand_cache.hits, self._operand_cache.misses
+        with self._hooks.timed("parse"):
+            sections = parser.parse(source)
+        self._hooks.operand_cache(
+            self._operand_cache.hits - hits,
+            self._operand_cache.misses - misses,
+            len(self._operand_cache),
+        )
+        self._raise_errors(parser)
+        return self._serialize(sections)
+
+    def assemble_parallel(
+        self,
+        source: str | Iterable[str],
+        processes: int | None = None,
+        chunk_lines: int = DEFAULT_CHUNK_LINES,
+        directory: str = "",
+    ) -> bytes:
+        """Assemble a program, encoding chunks of its lines in parallel.
+
+        The result is identical to that of assemble; only the encoding of
+        the lines is spread over worker processes, and the encoded lines
+        are then placed into their sections in order.
+
+        Args:
+            source: The source code, either as a whole or as an iterable of
+                lines (such as an open file).
+            processes: The number of worker processes; defaults to the number
+                of CPUs. With a single process the lines are encoded in this
+                process.
+            chunk_lines: The number of lines in a chunk of work.
+            directory: The directory of the source file, which the paths in
+                it are relative to; defaults to the working directory.
+        """
+        lines = list(source_lines(source))
+        parser = self._start_job(directory)
+        # Closing the chunks shuts the workers down in this thread, even
+        # when a line fails before all of them were consumed
+        with self._hooks.timed("parse"), closing(
+            encode_parallel(
+                self._compiled,
+                lines,
+                processes,
+                chunk_lines,
+                self._keep_going,
+                directory,
             )
-        ):
-            yield signature
-
-    def assemble(self, source: str) -> bytes:
-        """Assemble a program from a source file."""
-        self._parser.parse(source)
-        for section in self._parser.generate_sections():
-            self._manager.append_section(section)
-        return self._manager.to_bytes()
+        ) as chunks:
+            sections = parser.parse_encoded(lines, chunks)
+        self._raise_errors(parser)
+        return self._serialize(sections)
+
+    def _start_job(self, directory: str) -> Parser:
+        """Create the parser of a single source file, with empty sections."""
+        section_parsers = [parser.fork(directory) for parser in self._section_parsers]
+        if not self._instrumented:
+            return Parser(
+                section_parsers, self._line_cache, self._keep_going, self._operand_cache
+            )
+        return InstrumentedParser(
+            section_parsers,
+            self._line_cache,
+            self._keep_going,
+            self._operand_cache,
+            hooks=self._hooks,
+        )
+
+    def _serialize(self, sections: list[Section]) -> bytes:
+        """Serialize the parsed sections into an object file."""
+        with self._hooks.timed("serialize"):
+            manager = ObjectManager(self._object_parameters)
+            for section in sections:
+                manager.append_section(section)
+            return manager.to_bytes()
+
+    def _raise_errors(self, parser: Parser) -> None:
+        """Raise the errors recorded while keeping going, if there were any."""
+        if parser.errors:
+            raise AssemblerErrors(parser.errors)
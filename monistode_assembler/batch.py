@@ -0,0 +1,104 @@
+"""Assemble many source files in parallel."""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+from typing import Iterable, TextIO
+
+from .assemble import Assembler
+from .compiled import CompiledConfiguration
+
+
+@dataclass
+class BatchJob:
+    """A single source file to assemble, and where to write the object file."""
+
+    source: str
+    destination: str
+
+
+@dataclass
+class BatchResult:
+    """The outcome of a single job of a batch."""
+
+    job: BatchJob
+    error: str | None = None
+
+
+# The assembler of the current worker process, created once by the pool
+# initializer so that the configuration is not sent along with every job
+# and every job of the worker re-uses the same assembler.
+_worker_assembler: Assembler | None = None
+
+
+def _initialize_worker(compiled: CompiledConfiguration) -> None:
+    """Create the assembler of a worker process."""
+    global _worker_assembler
+    _worker_assembler = Assembler.from_compiled(compiled)
+
+
+def _assemble_job(job: BatchJob) -> BatchResult:
+    """Assemble a single job in a worker process."""
+    if _worker_assembler is None:
+        raise RuntimeError("The worker process was not initialized")
+    try:
+        with open(job.source) as source:
+            assembled = _worker_assembler.assemble(source, os.path.dirname(job.source))
+        with open(job.destination, "wb") as destination:
+            destination.write(assembled)
+    except Exception as error:  # Report the failure and keep the batch going
+        return BatchResult(job, str(error) or type(error).__name__)
+    return BatchResult(job)
+
+
+def assemble_many(
+    compiled: CompiledConfiguration,
+    jobs: Iterable[BatchJob],
+    processes: int | None = None,
+) -> list[BatchResult]:
+    """Assemble many source files with a pool of worker processes.
+
+    The configuration is compiled once by the caller and handed to every
+    worker when it starts. A failing job is reported in its result and
+    does not stop the rest of the batch.
+
+    Args:
+        compiled: The compiled configuration to assemble with.
+        jobs: The source files to assemble.
+        processes: The number of worker processes; defaults to the number
+            of CPUs. With a single process the jobs run in this process.
+
+    Returns:
+        The result of every job, in the order of the jobs.
+    """
+    jobs = list(jobs)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) <= 1:
+        _initialize_worker(compiled)
+        return [_assemble_job(job) for job in jobs]
+    with ProcessPoolExecutor(
+        processes, initializer=_initialize_worker, initargs=(compiled,)
+    ) as pool:
+        return list(
+            pool.map(
+                _assemble_job, jobs, chunksize=max(1, len(jobs) // (processes * 4))
+            )
+        )
+
+
+def read_manifest(manifest: TextIO) -> list[BatchJob]:
+    """Read the jobs of a batch from a manifest.
+
+    Every non-empty line of the manifest holds a source path and
+    a destination path separated by whitespace; lines starting with
+    a # are ignored.
+    """
+    jobs: list[BatchJob] = []
+    for line in manifest:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        paths = line.split(maxsplit=1)
+        if len(paths) != 2:
+            raise ValueError(f"Expected a source and a destination, got: {line}")
+        jobs.append(BatchJob(*paths))
+    return jobs
@@ -0,0 +1,730 @@
+"""Measure the throughput of the assembler on synthetic programs."""
+from dataclasses import dataclass, field
+import itertools
+import os
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+from monistode_binutils_shared import ObjectManager
+
+from .assemble import Assembler
+from .command_description import (
+    AddressArgument,
+    ConfigurationCommand,
+    ConfigurationImmediateArgument,
+    ConfigurationPaddingArgument,
+    ConfigurationRegisterAddressArgument,
+    ConfigurationRegisterAddressOffsetArgument,
+    ConfigurationRegisterArgument,
+    ConfigurationRegisterOffsetArgument,
+)
+from .compiled import CompiledConfiguration
+from .description import Configuration, RegisterGroup
+from .disassemble import Disassembler
+from .stats import AssemblyStats
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Runs of the same benchmark on a busy machine differ by up to a third,
+# so the fastest of several runs, taking a minimum time in total, is
+# compared with a loose threshold
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.3
+MIN_BENCHMARK_SECONDS = 0.2
+
+# The labels every synthetic program defines, at the start of its sections
+TEXT_LABEL = "start"
+DATA_LABEL = "d0"
+
+# A label is placed before every this many lines of a synthetic program
+LABEL_EVERY = 16
+
+# The widths of the bytes of the synthetic ISAs encoding is measured on
+ENCODING_BYTES = (8, 6)
+SYNTHETIC_COMMANDS = 16
+
+# The number of commands of the larger ISA command lookup is measured on,
+# and how much longer a line may take to assemble with it
+LOOKUP_COMMANDS = 4096
+LOOKUP_SLOWDOWN_LIMIT = 2.0
+
+# The modules the CLI may only import once a command needs them
+CLI_MODULE = "monistode_assembler.cli"
+LAZY_MODULES = ("asyncio", "pydantic", "yaml", "monistode_binutils_shared")
+
+_instruction = re.compile(r"[0-9a-f]+: (\S+)")
+_import_time = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+@dataclass
+class Instruction:
+    """A line of a synthetic program, and how it disassembles."""
+
+    line: str
+    mnemonic: str
+
+
+@dataclass
+class SyntheticProgram:
+    """A generated source file, and the mnemonics it should disassemble to."""
+
+    source: str
+    lines: int
+    mnemonics: list[str]
+
+
+@dataclass
+class Measurement:
+    """The throughput of a single benchmark."""
+
+    name: str
+    items: int
+    unit: str
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """The number of items processed per second."""
+        return self.items / self.seconds if self.seconds else 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Describe the measurement in a form that can be serialized to JSON."""
+        return {
+            "items": self.items,
+            "unit": self.unit,
+            "seconds": self.seconds,
+            "rate": self.rate,
+        }
+
+
+@dataclass
+class Allocations:
+    """The memory allocated while assembling a program."""
+
+    name: str
+    lines: int
+    peak_bytes: int
+
+    @property
+    def per_line(self) -> float:
+        """The peak number of bytes allocated per line of the program."""
+        return self.peak_bytes / self.lines if self.lines else 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Describe the allocations in a form that can be serialized to JSON."""
+        return {
+            "lines": self.lines,
+            "peak_bytes": self.peak_bytes,
+            "per_line": self.per_line,
+        }
+
+
+@dataclass
+class Regression:
+    """A benchmark that got worse than its baseline allows."""
+
+    name: str
+    baseline: float
+    current: float
+    unit: str
+
+    def __str__(self) -> str:
+        """Describe the regression."""
+        return (
+            f"{self.name}: {self.current:.0f} {self.unit}, "
+            f"{self.current / self.baseline - 1:+.0%} "
+            f"from {self.baseline:.0f} {self.unit}"
+        )
+
+
+@dataclass
+class BenchmarkReport:
+    """The measurements of a benchmark run, and the checks that failed.
+
+    Failures are outputs that are wrong, whatever the machine; budgets
+    that were exceeded depend on timings, so a busy machine can exceed
+    them without anything being wrong.
+    """
+
+    configuration: str
+    measurements: list[Measurement] = field(default_factory=list)
+    allocations: list[Allocations] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+    over_budget: list[str] = field(default_factory=list)
+    skipped_commands: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Describe the report in a form that can be serialized to JSON."""
+        return {
+            "configuration": self.configuration,
+            "results": {
+                measurement.name: measurement.as_dict()
+                for measurement in self.measurements
+            },
+            "allocations": {
+                allocations.name: allocations.as_dict()
+                for allocations in self.allocations
+            },
+            "failures": self.failures,
+            "over_budget": self.over_budget,
+            "skipped_commands": self.skipped_commands,
+        }
+
+
+def _register_names(group: RegisterGroup) -> list[str]:
+    """Get the names of the registers of a group, in index order."""
+    if isinstance(group.registers, list):
+        return group.registers
+    return sorted(group.registers, key=group.registers.__getitem__)
+
+
+class ProgramGenerator:
+    """Generate programs that use every command of a configuration.
+
+    Each command is spelled with numeric operands and, where the command
+    takes any, with label operands. Every spelling is assembled and
+    disassembled once on its own, and those the configuration cannot
+    round-trip are left out.
+    """
+
+    def __init__(self, compiled: CompiledConfiguration) -> None:
+        """Initialize the generator and check the spellings of the commands.
+
+        Args:
+            compiled: The compiled configuration to generate programs for.
+        """
+        self._compiled = compiled
+        self._configuration = compiled.configuration
+        self.instructions: list[Instruction] = []
+        self.data: list[str] = []
+        self.skipped: list[str] = []
+        for command in self._configuration.commands:
+            instructions = [
+                instruction
+                for instruction in map(
+                    self._check_instruction, self._spellings(command)
+                )
+                if instruction is not None
+            ]
+            if not instructions:
+                self.skipped.append(command.mnemonic)
+            self.instructions.extend(instructions)
+        self.data = [line for line in self._data_spellings() if self._check_data(line)]
+
+    def generate(self, lines: int) -> SyntheticProgram:
+        """Generate a program of about the given number of lines.
+
+        An eighth of the lines are data directives, if the configuration
+        can encode any data; the rest are instructions and their labels.
+        """
+        data_lines = lines // 8 if self.data else 0
+        instructions = itertools.cycle(self.instructions)
+        source = [".text", f"{TEXT_LABEL}:"]
+        mnemonics = []
+        for number in range(max(lines - data_lines, 1)):
+            if number and number % LABEL_EVERY == 0:
+                source.append(f"t{number}:")
+            instruction = next(instructions)
+            source.append(f"    {instruction.line}")
+            mnemonics.append(instruction.mnemonic)
+        source += [".data", f"{DATA_LABEL}:", "    byte 0"]
+        data = itertools.cycle(self.data)
+        for number in range(data_lines):
+            if number % LABEL_EVERY == 0:
+                source.append(f"d{number + 1}:")
+            source.append(f"    {next(data)}")
+        return SyntheticProgram("\n".join(source), len(source), mnemonics)
+
+    def _spellings(self, command: ConfigurationCommand) -> Iterator[str]:
+        """Spell a command with numeric operands, then with labels."""
+        numeric = [
+            self._operand(argument, index, False)
+            for index, argument in enumerate(command.arguments)
+        ]
+        labels = [
+            self._operand(argument, index, True)
+            for index, argument in enumerate(command.arguments)
+        ]
+        yield self._spell(command.mnemonic, numeric)
+        if labels != numeric:
+            yield self._spell(command.mnemonic, labels)
+
+    @staticmethod
+    def _spell(mnemonic: str, operands: list[str | None]) -> str:
+        """Join a mnemonic and its operands into a line."""
+        present = [operand for operand in operands if operand is not None]
+        return f"{mnemonic} {', '.join(present)}" if present else mnemonic
+
+    def _operand(self, argument: Any, index: int, label: bool) -> str | None:
+        """Spell an operand of the given kind, with a label if it takes one.
+
+        Args:
+            argument: The description of the operand.
+            index: The position of the operand, to pick a register by.
+            label: Whether to spell the operand with a label if it takes one.
+        """
+        if isinstance(argument, ConfigurationPaddingArgument):
+            return None
+        if isinstance(argument, ConfigurationImmediateArgument):
+            return f"${DATA_LABEL}" if label else "$1"
+        if isinstance(argument, AddressArgument):
+            if not label:
+                return "1"
+            return TEXT_LABEL if argument.type == "text_address" else DATA_LABEL
+        register = _register_names(self._configuration.register_groups[argument.group])
+        name = "%" + register[index % len(register)]
+        if isinstance(argument, ConfigurationRegisterArgument):
+            return name
+        if isinstance(argument, ConfigurationRegisterAddressArgument):
+            return f"[{name}]"
+        offset = DATA_LABEL if label else "1"
+        if isinstance(argument, ConfigurationRegisterOffsetArgument):
+            return f"{name} + {offset}"
+        if isinstance(argument, ConfigurationRegisterAddressOffsetArgument):
+            return f"[{name} + {offset}]"
+        raise TypeError(f"Unknown argument type {type(argument).__name__}")
+
+    def _data_spellings(self) -> Iterator[str]:
+        """Spell each data directive."""
+        yield 'ascii "synthetic"'
+        yield 'asciiz "data\\n"'
+        yield "byte 1, 2, 3, 4, 5, 6, 7, 8"
+        yield "word 1, 2, 3, 4"
+        yield "dword 1, 2"
+        yield "fill 4, 1, 1"
+        yield "zero 8"
+
+    def _round_trip(self, source: str) -> list[str] | None:
+        """Assemble and disassemble a source, getting its mnemonics."""
+        try:
+            binary = Assembler.from_compiled(self._compiled).assemble(source)
+            return disassembled_mnemonics(
+                Disassembler(self._configuration, binary).disassemble()
+            )
+        except Exception:  # The configuration cannot spell this, leave it out
+            return None
+
+    def _check_instruction(self, line: str) -> Instruction | None:
+        """Check that an instruction round-trips on its own."""
+        mnemonics = self._round_trip(
+            f".text\n{TEXT_LABEL}:\n    {line}\n.data\n{DATA_LABEL}:\n    byte 0"
+        )
+        if mnemonics is None or len(mnemonics) != 1:
+            return None
+        return Instruction(line, mnemonics[0])
+
+    def _check_data(self, line: str) -> bool:
+        """Check that a data directive assembles on its own."""
+        return self._round_trip(f".data\n{DATA_LABEL}:\n    {line}") is not None
+
+
+def synthetic_configuration(byte: int, commands: int) -> Configuration:
+    """Describe an ISA with bytes of the given width and as many commands.
+
+    The opcode of command n is n, and takes up the first two bytes of the
+    command. The commands take, in turn, a register and an immediate, two
+    registers, a register and a register address, and a text address, so
+    that an ISA with more commands encodes the commands of one with fewer
+    in the same way.
+    """
+    operands: list[list[dict[str, Any]]] = [
+        [{"type": "register", "group": "gp"}, {"type": "immediate", "bits": 2 * byte}],
+        [{"type": "register", "group": "gp"}, {"type": "register", "group": "gp"}],
+        [
+            {"type": "register", "group": "gp"},
+            {"type": "register_address", "group": "gp"},
+        ],
+        [{"type": "text_address", "bits": 2 * byte}],
+    ]
+    return Configuration(
+        opcode_length=2 * byte,
+        opcode_offset=0,
+        text_byte_length=byte,
+        data_byte_length=8,
+        text_address_size=2 * byte,
+        data_address_size=2 * byte,
+        commands=[
+            ConfigurationCommand(
+                mnemonic=f"op{opcode}",
+                opcode=opcode,
+                arguments=operands[opcode % len(operands)],
+            )
+            for opcode in range(commands)
+        ],
+        register_groups={
+            "gp": RegisterGroup(
+                length=byte, registers=[f"r{index}" for index in range(8)]
+            )
+        },
+    )
+
+
+def disassembled_mnemonics(disassembly: str) -> list[str]:
+    """Get the mnemonics of the text section of a disassembly, in order."""
+    text = disassembly.partition("\n.text\n")[2].partition("\n\n")[0]
+    return [
+        match.group(1)
+        for match in map(_instruction.match, text.splitlines())
+        if match is not None
+    ]
+
+
+def _fastest(repeat: int, run: Callable[[], tuple[float, Any]]) -> tuple[float, Any]:
+    """Keep the fastest of several runs of a function that times itself.
+
+    The function is run at least repeat times, and until its runs took
+    MIN_BENCHMARK_SECONDS in total, so that the fastest run of a short
+    benchmark is picked out of enough of them to be stable.
+    """
+    best = float("inf")
+    result = None
+    runs = 0
+    total = 0.0
+    while runs < repeat or total < MIN_BENCHMARK_SECONDS:
+        seconds, result = run()
+        best = min(best, seconds)
+        runs += 1
+        total += seconds
+    return best, result
+
+
+def _best_of(repeat: int, function: Callable[[], Any]) -> tuple[float, Any]:
+    """Time a function, keeping the fastest of several runs."""
+
+    def run() -> tuple[float, Any]:
+        start = time.perf_counter()
+        result = function()
+        return time.perf_counter() - start, result
+
+    return _fastest(repeat, run)
+
+
+def measure_allocations(
+    compiled: CompiledConfiguration, program: SyntheticProgram, name: str
+) -> Allocations:
+    """Trace the memory allocated while assembling a program.
+
+    Only the assembly itself is traced; the configuration and the source
+    are created beforehand.
+    """
+    tracemalloc.start()
+    try:
+        Assembler.from_compiled(compiled).assemble(program.source)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Allocations(name, program.lines, peak)
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """Import a module in a fresh interpreter, timing it with -X importtime.
+
+    The interpreter runs next to this package, so it imports the same copy.
+
+    Returns:
+        The seconds the import took, and the names of every module it
+        imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    cumulative = {
+        match.group(2): int(match.group(1))
+        for match in map(_import_time.match, result.stderr.splitlines())
+        if match is not None
+    }
+    return cumulative[module] / 1e6, set(cumulative)
+
+
+def eager_imports(imported: set[str]) -> list[str]:
+    """Get the lazily imported modules among the given imported modules."""
+    return [module for module in LAZY_MODULES if module in imported]
+
+
+def check_import_budget(report: BenchmarkReport, repeat: int) -> None:
+    """Time the start-up of the CLI, and check what it imports.
+
+    Starting the CLI must not import any of the lazily imported modules;
+    a failure is added to the report for each one it does import.
+    """
+    seconds, imported = min(import_time(CLI_MODULE) for _ in range(repeat))
+    report.measurements.append(Measurement("import/cli", 1, "imports", seconds))
+    for module in eager_imports(imported):
+        report.over_budget.append(f"{CLI_MODULE} imports {module} on start-up")
+
+
+def measure_data_layout(
+    report: BenchmarkReport, compiled: CompiledConfiguration, size: int, repeat: int
+) -> None:
+    """Measure the same bytes written a value per line and all on one line.
+
+    Every line costs about as much to lex and match as an instruction, so
+    a table written a value per line is much slower to assemble than the
+    same table on one line. A failure is added to the report when the two
+    layouts assemble to different bytes.
+    """
+    values = [
+        str(index % (1 << compiled.configuration.data_byte_length))
+        for index in range(size)
+    ]
+    layouts = {
+        "per-line": "\n".join([".data"] + [f"byte {value}" for value in values]),
+        "one-line": ".data\nbyte " + ", ".join(values),
+    }
+    binaries = []
+    for layout, source in layouts.items():
+        seconds, binary = _best_of(
+            repeat, lambda: Assembler.from_compiled(compiled).assemble(source)
+        )
+        report.measurements.append(
+            Measurement(f"data/{layout}/{size}", size, "bytes", seconds)
+        )
+        binaries.append(binary)
+    if binaries[0] != binaries[1]:
+        report.failures.append(
+            f"{size} bytes: assembled differently a value per line and on one line"
+        )
+
+
+def measure_encoding(
+    report: BenchmarkReport, sizes: tuple[int, ...], repeat: int
+) -> None:
+    """Measure encoding on synthetic ISAs with bytes of different widths.
+
+    Bytes of eight bits are packed in bulk and others bit by bit, so the
+    encoding phase is measured for each width whatever the configuration
+    being benchmarked uses.
+    """
+    for byte in ENCODING_BYTES:
+        compiled = CompiledConfiguration.compile(
+            synthetic_configuration(byte, SYNTHETIC_COMMANDS)
+        )
+        generator = ProgramGenerator(compiled)
+        for size in sizes:
+            program = generator.generate(size)
+
+            def encode() -> tuple[float, None]:
+                stats = AssemblyStats()
+                Assembler.from_compiled(compiled, hooks=stats).assemble(program.source)
+                return stats.phases["encode"], None
+
+            fastest, _ = _fastest(repeat, encode)
+            report.measurements.append(
+                Measurement(
+                    f"encode/{byte}-bit/{size}",
+                    len(program.mnemonics),
+                    "instructions",
+                    fastest,
+                )
+            )
+
+
+def measure_lookup(
+    report: BenchmarkReport, sizes: tuple[int, ...], repeat: int
+) -> None:
+    """Measure assembly on synthetic ISAs with few and with many commands.
+
+    The same program, using only the commands of the smaller ISA, is
+    assembled with both by a re-used assembler, so that only the lines
+    are timed and not the building of the tables. Looking up a command
+    should not depend on the number of commands, so a failure is added
+    to the report when a line takes more than LOOKUP_SLOWDOWN_LIMIT times
+    as long with the larger ISA, or when the two encode it differently.
+    """
+    small, large = (
+        CompiledConfiguration.compile(synthetic_configuration(8, commands))
+        for commands in (SYNTHETIC_COMMANDS, LOOKUP_COMMANDS)
+    )
+    generator = ProgramGenerator(small)
+    for size in sizes:
+        program = generator.generate(size)
+        timings = []
+        binaries = []
+        for compiled in (small, large):
+            assembler = Assembler.from_compiled(compiled)
+            seconds, binary = _best_of(
+                repeat, lambda: assembler.assemble(program.source)
+            )
+            commands = len(compiled.configuration.commands)
+            report.measurements.append(
+                Measurement(
+                    f"lookup/{commands}-commands/{size}",
+                    program.lines,
+                    "lines",
+                    seconds,
+                )
+            )
+            timings.append(seconds)
+            binaries.append(binary)
+        if binaries[0] != binaries[1]:
+            report.failures.append(
+                f"{size} lines: assembled to different bytes with "
+                f"{LOOKUP_COMMANDS} commands"
+            )
+        if timings[1] > timings[0] * LOOKUP_SLOWDOWN_LIMIT:
+            report.over_budget.append(
+                f"{size} lines: {timings[1] / timings[0]:.1f} times as slow "
+                f"with {LOOKUP_COMMANDS} commands as with {SYNTHETIC_COMMANDS}"
+            )
+
+
+def run_benchmarks(
+    compiled: CompiledConfiguration,
+    name: str,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+) -> BenchmarkReport:
+    """Benchmark the assembler and disassembler on synthetic programs.
+
+    For every size, this measures the lines per second of assembly, with a
+    new assembler and with one that is re-used for every run, the
+    instructions per second of its encoding phase and of disassembly, and
+    the bytes per second of a program made of data directives only and of a
+    table of bytes written a value per line and on one line, as well as the
+    peak memory assembly allocates per line. Every program is also
+    checked to disassemble to the instructions it was generated from, and
+    to assemble to the same bytes each time. Encoding is then measured on
+    synthetic ISAs with 8-bit and 6-bit bytes, and assembly on synthetic
+    ISAs with few and many commands. Finally, the start-up of the CLI is
+    timed and checked against its import budget.
+
+    Args:
+        compiled: The compiled configuration to benchmark.
+        name: The name of the configuration, for the report.
+        sizes: The numbers of lines of the programs to benchmark with.
+        repeat: The number of times to run each benchmark, keeping the
+            fastest run.
+    """
+    generator = ProgramGenerator(compiled)
+    report = BenchmarkReport(name, skipped_commands=generator.skipped)
+    for size in sizes:
+        program = generator.generate(size)
+
+        def assemble() -> bytes:
+            return Assembler.from_compiled(compiled).assemble(program.source)
+
+        seconds, binary = _best_of(repeat, assemble)
+        report.measurements.append(
+            Measurement(f"assemble/{size}", program.lines, "lines", seconds)
+        )
+
+        assembler = Assembler.from_compiled(compiled)
+        seconds, reassembled = _best_of(
+            repeat, lambda: assembler.assemble(program.source)
+        )
+        report.measurements.append(
+            Measurement(f"reassemble/{size}", program.lines, "lines", seconds)
+        )
+        if reassembled != binary:
+            report.failures.append(
+                f"{size} lines: assembled to different bytes by a re-used assembler"
+            )
+
+        stats = AssemblyStats()
+        if (
+            Assembler.from_compiled(compiled, hooks=stats).assemble(program.source)
+            != binary
+        ):
+            report.failures.append(
+                f"{size} lines: assembled to different bytes on another run"
+            )
+        report.allocations.append(
+            measure_allocations(compiled, program, f"allocations/{size}")
+        )
+        report.measurements.append(
+            Measurement(
+                f"encode/{size}",
+                len(program.mnemonics),
+                "instructions",
+                stats.phases["encode"],
+            )
+        )
+
+        seconds, disassembly = _best_of(
+            repeat,
+            lambda: Disassembler(compiled.configuration, binary).disassemble(),
+        )
+        report.measurements.append(
+            Measurement(
+                f"disassemble/{size}",
+                len(program.mnemonics),
+                "instructions",
+                seconds,
+            )
+        )
+        if disassembled_mnemonics(disassembly) != program.mnemonics:
+            report.failures.append(
+                f"{size} lines: disassembled to different instructions"
+            )
+
+        if generator.data:
+            data = itertools.cycle(generator.data)
+            source = "\n".join([".data"] + [next(data) for _ in range(size)])
+            seconds, binary = _best_of(
+                repeat,
+                lambda: Assembler.from_compiled(compiled).assemble(source),
+            )
+            report.measurements.append(
+                Measurement(f"data/{size}", data_bytes(binary), "bytes", seconds)
+            )
+            measure_data_layout(report, compiled, size, repeat)
+    measure_encoding(report, sizes, repeat)
+    measure_lookup(report, sizes, repeat)
+    check_import_budget(report, repeat)
+    return report
+
+
+def data_bytes(binary: bytes) -> int:
+    """Get the size of the data section of an object file."""
+    return sum(
+        len(section.data)
+        for section in ObjectManager.from_bytes(binary)._sections
+        if section.name == "data"
+    )
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Find the benchmarks that got worse than a baseline allows.
+
+    Args:
+        baseline: A report from an earlier run, as returned by as_dict.
+        current: A report from this run, as returned by as_dict.
+        threshold: The fraction of its baseline rate a benchmark may lose,
+            and of its baseline allocations it may add.
+
+    Returns:
+        The benchmarks of both reports whose rate dropped, or whose
+        allocations per line grew, by more than the threshold; benchmarks
+        in only one of the reports are ignored.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or not previous["rate"]:
+            continue
+        if result["rate"] < previous["rate"] * (1 - threshold):
+            regressions.append(
+                Regression(
+                    name, previous["rate"], result["rate"], f"{result['unit']}/s"
+                )
+            )
+    for name, result in current.get("allocations", {}).items():
+        previous = baseline.get("allocations", {}).get(name)
+        if previous is None:
+            continue
+        if result["per_line"] > previous["per_line"] * (1 + threshold):
+            regressions.append(
+                Regression(name, previous["per_line"], result["per_line"], "bytes/line")
+            )
+    return regressions
@@ -1,11 +1,33 @@
-"""A CLI for the assembler."""
+"""A CLI for the assembler.
+
+The modules behind each command are imported by the command itself, so
+that starting the CLI, asking for help or reading an object file header
+does not pay for loading the whole assembler.
+"""
+
+import base64
+import json
+import os
+import sys
+from typing import NoReturn
 
 import click
-import yaml
 
-from .assemble import Assembler
-from .description import Configuration
-from .disassemble import Disassembler
+from .arguments.operand_cache import DEFAULT_OPERAND_CACHE_SIZE
+from .exceptions import AssemblerError, AssemblerErrors
+
+isa_cache_option = click.option(
+    "--isa-cache",
+    type=click.Path(file_okay=False),
+    envvar="MONISTODE_ISA_CACHE",
+    help="A directory to cache compiled configurations in.",
+)
+server_option = click.option(
+    "--server",
+    type=click.Path(dir_okay=False),
+    envvar="MONISTODE_ASSEMBLER_SERVER",
+    help="The socket of a running 'serve' process to send the request to.",
+)
 
 
 @click.group()
@@ -18,30 +40,390 @@ def main() -> None:
 @click.argument("configuration", type=click.File("r"))
 @click.argument("source", type=click.File("r"))
 @click.argument("destination", type=click.File("wb"))
-def assemble(source, destination, configuration) -> None:
+@isa_cache_option
+@click.option(
+    "--watch",
+    "watch_source",
+    is_flag=True,
+    help="Keep running and re-assemble whenever the source changes.",
+)
+@server_option
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Encode chunks of the source with this many worker processes.",
+)
+@click.option(
+    "--keep-going",
+    is_flag=True,
+    help="Skip lines with errors and report all of them at the end.",
+)
+@click.option(
+    "--error-format",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="How to report errors; json writes a list of objects to stderr.",
+)
+@click.option(
+    "--stats",
+    type=click.File("w"),
+    help="Write timings and counters of the assembly to a file, as JSON.",
+)
+@click.option(
+    "--operand-cache-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_OPERAND_CACHE_SIZE,
+    show_default=True,
+    help="The number of scanned operands to keep for re-use; 0 disables it.",
+)
+def assemble(
+    source,
+    destination,
+    configuration,
+    isa_cache,
+    watch_source,
+    server,
+    jobs,
+    keep_going,
+    error_format,
+    stats,
+    operand_cache_size,
+) -> None:
     """Assemble a source file into an object file."""
-    assembler = Assembler(configuration=Configuration(**yaml.safe_load(configuration)))
-    assembled = assembler.assemble(source.read())
+    if server is not None:
+        # The server assembles with its own defaults, so these would be ignored
+        _reject_with_server(
+            watch=watch_source,
+            jobs=jobs is not None,
+            keep_going=keep_going,
+            error_format=error_format != "text",
+            stats=stats is not None,
+            operand_cache_size=operand_cache_size != DEFAULT_OPERAND_CACHE_SIZE,
+        )
+    if jobs is not None and watch_source:
+        raise click.UsageError("--jobs cannot be combined with --watch")
+    # Included files are relative to the source, or to the working
+    # directory if the source is read from stdin
+    directory = "" if source.name == "-" else os.path.dirname(source.name)
+    if server is not None:
+        assembled = _request(
+            server,
+            {
+                "command": "assemble",
+                "configuration": os.path.abspath(configuration.name),
+                "source": source.read(),
+                "directory": os.path.abspath(directory),
+            },
+        )
+        destination.write(base64.b64decode(assembled))
+        return
+    from .assemble import Assembler
+    from .compiled import CompiledConfiguration
+    from .stats import AssemblyStats
+
+    assembly_stats = AssemblyStats()
+    with assembly_stats.timed("configuration"):
+        compiled = CompiledConfiguration.from_yaml(configuration.read(), isa_cache)
+    if watch_source:
+        if source.name == "-" or destination.name == "-":
+            raise click.UsageError("--watch needs a source and a destination file")
+        from .watch import watch
+
+        watch(
+            compiled,
+            source.name,
+            destination.name,
+            lambda message: click.echo(message, err=True),
+        )
+        return
+    assembler = Assembler.from_compiled(
+        compiled,
+        keep_going=keep_going,
+        hooks=assembly_stats if stats is not None else None,
+        operand_cache_size=operand_cache_size,
+    )
+    try:
+        if jobs is not None:
+            assembled = assembler.assemble_parallel(source, jobs, directory=directory)
+        else:
+            assembled = assembler.assemble(source, directory)
+    except AssemblerError as error:
+        if error_format == "text" and not isinstance(error, AssemblerErrors):
+            raise
+        _report_errors(
+            error.errors if isinstance(error, AssemblerErrors) else [error],
+            error_format,
+        )
+    finally:
+        if stats is not None:
+            json.dump(assembly_stats.as_dict(), stats, indent=2)
+            stats.write("\n")
     destination.write(assembled)
 
 
+@main.command("assemble-many")
+@click.argument("configuration", type=click.File("r"))
+@click.argument("files", nargs=-1, type=click.Path(dir_okay=False))
+@click.option(
+    "--manifest",
+    type=click.File("r"),
+    help="A file with a SOURCE DESTINATION pair per line.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="The number of worker processes. Defaults to the number of CPUs.",
+)
+@isa_cache_option
+def assemble_many(configuration, files, manifest, jobs, isa_cache) -> None:
+    """Assemble many source files, given as SOURCE DESTINATION pairs."""
+    from .batch import BatchJob, assemble_many as assemble_batch, read_manifest
+    from .compiled import CompiledConfiguration
+
+    if len(files) % 2:
+        raise click.UsageError("FILES must be SOURCE DESTINATION pairs")
+    batch = [
+        BatchJob(source, destination)
+        for source, destination in zip(files[::2], files[1::2])
+    ]
+    if manifest is not None:
+        try:
+            batch.extend(read_manifest(manifest))
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint="--manifest")
+    results = assemble_batch(
+        CompiledConfiguration.from_yaml(configuration.read(), isa_cache),
+        batch,
+        jobs,
+    )
+    failed = [result for result in results if result.error is not None]
+    for result in failed:
+        click.echo(f"{result.job.source}: {result.error}", err=True)
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} of {len(results)} files failed to assemble"
+        )
+
+
 @main.command()
 @click.argument("configuration", type=click.File("r"))
 @click.argument("source", type=click.File("rb"))
 @click.argument("destination", type=click.File("w"), default="-")
 @click.option("--header-only", is_flag=True)
-def disassemble(source, destination, configuration, header_only) -> None:
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Write lines as they are decoded, aligned to a fixed column.",
+)
+@click.option(
+    "--column-width",
+    type=click.IntRange(min=0),
+    help="The column to align notes to when streaming.",
+)
+@isa_cache_option
+@server_option
+def disassemble(
+    source,
+    destination,
+    configuration,
+    header_only,
+    stream,
+    column_width,
+    isa_cache,
+    server,
+) -> None:
     """Disassemble an object file into a source file."""
+    if server is not None:
+        _reject_with_server(stream=stream, column_width=column_width is not None)
+        disassembled = _request(
+            server,
+            {
+                "command": "disassemble",
+                "configuration": os.path.abspath(configuration.name),
+                "binary": base64.b64encode(source.read()).decode(),
+                "header_only": header_only,
+            },
+        )
+        destination.write(disassembled + "\n")
+        return
+    if header_only:
+        # The header does not depend on the ISA, so it is not compiled
+        from monistode_binutils_shared.object_manager import ObjectManager
+
+        destination.write(ObjectManager.from_bytes(source.read()).summary() + "\n")
+        return
+    from .compiled import CompiledConfiguration
+    from .disassemble import Disassembler
+
     disassembler = Disassembler(
-        configuration=Configuration(**yaml.safe_load(configuration)),
+        configuration=CompiledConfiguration.from_yaml(
+            configuration.read(), isa_cache
+        ).configuration,
         binary=source.read(),
     )
-    if header_only:
-        disassembled = disassembler.disassemble_header()
+    if stream:
+        for line in disassembler.disassemble_lines(column_width):
+            destination.write(line + "\n")
+        return
     else:
         disassembled = disassembler.disassemble()
     destination.write(disassembled + "\n")
 
 
+@main.command()
+@click.argument("socket_path", metavar="SOCKET", type=click.Path(dir_okay=False))
+@click.argument("configurations", nargs=-1, type=click.Path(dir_okay=False))
+@click.option(
+    "-j",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="The number of worker processes. Defaults to the number of CPUs.",
+)
+@isa_cache_option
+def serve(socket_path, configurations, workers, isa_cache) -> None:
+    """Serve assemble and disassemble requests on a Unix socket.
+
+    The given configurations are checked and loaded by every worker ahead
+    of time; others are loaded on their first request. Every configuration
+    is reloaded when its file changes.
+    """
+    import asyncio
+
+    from .compiled import CompiledConfiguration
+    from .server import AssemblerServer
+
+    for configuration in configurations:
+        with open(configuration) as file:
+            CompiledConfiguration.from_yaml(file.read(), isa_cache)
+    try:
+        asyncio.run(
+            AssemblerServer(socket_path, configurations, isa_cache, workers).serve()
+        )
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        raise click.ClickException(str(error))
+
+
+@main.command()
+@click.argument("configuration", type=click.File("r"))
+@click.option(
+    "-s",
+    "--size",
+    "sizes",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="The number of lines of a synthetic program; may be repeated.",
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Run each benchmark this many times and keep the fastest run.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    help="Write the results to a file, as JSON.",
+)
+@click.option(
+    "--baseline",
+    type=click.File("r"),
+    help="Results of an earlier run to check for regressions against.",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0, max=1),
+    default=0.3,
+    show_default=True,
+    help="The fraction of its baseline rate a benchmark may lose.",
+)
+@isa_cache_option
+def benchmark(
+    configuration, sizes, repeat, output, baseline, threshold, isa_cache
+) -> None:
+    """Measure the throughput of the assembler on synthetic programs.
+
+    Programs using every command of the configuration are generated at
+    each size, assembled and disassembled, and checked to round-trip. The
+    start-up of the CLI is checked not to import the modules it loads lazily.
+    """
+    from .benchmark import DEFAULT_SIZES, compare, run_benchmarks
+    from .compiled import CompiledConfiguration
+
+    report = run_benchmarks(
+        CompiledConfiguration.from_yaml(configuration.read(), isa_cache),
+        configuration.name,
+        sizes or DEFAULT_SIZES,
+        repeat,
+    )
+    for command in report.skipped_commands:
+        click.echo(f"{command}: could not be spelled, left out", err=True)
+    for measurement in report.measurements:
+        click.echo(
+            f"{measurement.name:<28} {measurement.rate:>14.0f} "
+            f"{measurement.unit}/s ({measurement.seconds:.3f}s)"
+        )
+    for allocations in report.allocations:
+        click.echo(
+            f"{allocations.name:<28} {allocations.per_line:>14.0f} bytes/line "
+            f"({allocations.peak_bytes} bytes at peak)"
+        )
+    results = report.as_dict()
+    if output is not None:
+        json.dump(results, output, indent=2)
+        output.write("\n")
+    failures = (
+        report.failures
+        + report.over_budget
+        + [
+            str(regression)
+            for regression in (
+                compare(json.load(baseline), results, threshold)
+                if baseline is not None
+                else []
+            )
+        ]
+    )
+    for failure in failures:
+        click.echo(failure, err=True)
+    if failures:
+        raise click.ClickException(f"{len(failures)} benchmarks failed")
+
+
+def _report_errors(errors: list[AssemblerError], error_format: str) -> NoReturn:
+    """Report the errors of an assembly and exit with a failure."""
+    if error_format == "json":
+        click.echo(json.dumps([error.as_dict() for error in errors]), err=True)
+    else:
+        for error in errors:
+            click.echo(str(error), err=True)
+        click.echo(f"{len(errors)} errors", err=True)
+    sys.exit(1)
+
+
+def _reject_with_server(**options: bool) -> None:
+    """Fail if any of the given options, which a server ignores, is used."""
+    used = [
+        "--" + name.replace("_", "-") for name, is_used in options.items() if is_used
+    ]
+    if used:
+        raise click.UsageError(f"--server cannot be combined with {', '.join(used)}")
+
+
+def _request(server: str, payload: dict) -> str:
+    """Send a request to a running server, reporting failures as CLI errors."""
+    from . import client
+
+    try:
+        return client.request(server, payload)
+    except (AssemblerError, OSError) as error:
+        raise click.ClickException(str(error))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,29 @@
+"""A client for a running assembler server."""
+import json
+import socket
+from typing import Any
+
+from .exceptions import AssemblerError
+
+
+def request(socket_path: str, payload: dict[str, Any]) -> Any:
+    """Send a single request to an assembler server.
+
+    Args:
+        socket_path: The path of the server's Unix socket.
+        payload: The request, as described in the server module.
+
+    Returns:
+        The result of the request.
+
+    Raises:
+        AssemblerError: If the server could not fulfil the request.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(payload).encode() + b"\n")
+        with connection.makefile("rb") as responses:
+            response = json.loads(responses.readline())
+    if not response["ok"]:
+        raise AssemblerError(response["error"])
+    return response["result"]
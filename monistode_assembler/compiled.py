@@ -0,0 +1,171 @@
+"""Compiled instruction set descriptions and their on-disk cache."""
+from dataclasses import dataclass
+import functools
+import hashlib
+import itertools
+import os
+import pickle
+import tempfile
+from typing import Iterator
+
+import pydantic
+import yaml
+
+from .arguments.common import ArgumentParser
+from .command_description import ConfigurationCommand
+from .description import Configuration
+from .sections.common import SectionParser
+from .sections.data import DataSectionParameters, DataSectionParser
+from .sections.text import (
+    CommandDefinition,
+    TextSectionParameters,
+    TextSectionParser,
+)
+from .sections.text_argument import TextArgument
+
+
+def signatures_for(
+    command: ConfigurationCommand, configuration: Configuration
+) -> Iterator[tuple[ArgumentParser[TextArgument], ...]]:
+    """Generate all possible signatures for a command.
+
+    Args:
+        command (ConfigurationCommand): The command to generate signatures for
+        configuration (Configuration): The configuration the command belongs to
+
+    Yields:
+        tuple[ArgumentParser[TextArgument], ...]: The signature,
+            as a tuple of argument parsers
+    """
+    for signature in itertools.product(
+        *(argument.get_parsers(configuration) for argument in command.arguments)
+    ):
+        yield signature
+
+
+def expand_commands(configuration: Configuration) -> list[CommandDefinition]:
+    """Expand the commands of a configuration into all of their signatures.
+
+    Args:
+        configuration (Configuration): The configuration to expand
+
+    Returns:
+        list[CommandDefinition]: A definition for every signature of every command
+    """
+    return [
+        CommandDefinition(
+            mnemonic=command.mnemonic,
+            opcode=command.opcode,
+            arguments=signature,
+            pre_opcode_arguments=command.get_n_pre_opcode_arguments(
+                configuration.opcode_offset, configuration
+            ),
+        )
+        for command in configuration.commands
+        for signature in signatures_for(command, configuration)
+    ]
+
+
+@dataclass
+class CompiledConfiguration:
+    """A validated configuration together with its expanded command table."""
+
+    configuration: Configuration
+    commands: list[CommandDefinition]
+
+    @classmethod
+    def compile(cls, configuration: Configuration) -> "CompiledConfiguration":
+        """Validate and expand a configuration."""
+        return cls(configuration, expand_commands(configuration))
+
+    @classmethod
+    def from_yaml(
+        cls, source: str, cache_directory: str | None = None
+    ) -> "CompiledConfiguration":
+        """Compile a configuration from its YAML source.
+
+        If a cache directory is given, the compiled tables are looked up there
+        by a hash of the source first, and stored there after compiling.
+
+        Args:
+            source (str): The YAML source of the configuration
+            cache_directory (str | None): The directory to cache compiled tables in
+        """
+        if cache_directory is None:
+            return cls.compile(Configuration(**yaml.safe_load(source)))
+        path = os.path.join(cache_directory, f"{cache_key(source)}.pickle")
+        try:
+            with open(path, "rb") as file:
+                compiled = pickle.load(file)
+            if isinstance(compiled, cls):
+                return compiled
+        except Exception:
+            # A missing, truncated or stale cache entry (one pickled before
+            # the classes in it changed) is simply compiled again
+            pass
+        compiled = cls.compile(Configuration(**yaml.safe_load(source)))
+        compiled.store(path)
+        return compiled
+
+    def section_parsers(self) -> list[SectionParser]:
+        """Create fresh parsers for the sections of a source file."""
+        return [
+            TextSectionParser(
+                parameters=TextSectionParameters(
+                    byte=self.configuration.text_byte_length,
+                    opcode_offset=self.configuration.opcode_offset,
+                    opcode_length=self.configuration.opcode_length,
+                    text_address_bits=self.configuration.text_address_size,
+                    data_address_bits=self.configuration.data_address_size,
+                ),
+                commands=self.commands,
+            ),
+            DataSectionParser(
+                parameters=DataSectionParameters(
+                    byte=self.configuration.data_byte_length,
+                    data_address_bits=self.configuration.data_address_size,
+                )
+            ),
+        ]
+
+    def store(self, path: str) -> None:
+        """Atomically store the compiled tables at the given path."""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+
+def cache_key(source: str) -> str:
+    """Get the cache key of a configuration's YAML source.
+
+    The key also covers the code the pickled tables are made of, so that
+    entries pickled by another version of it are not found, instead of
+    being loaded and failing later on.
+    """
+    digest = hashlib.sha256(_code_digest())
+    digest.update(source.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@functools.cache
+def _code_digest() -> bytes:
+    """Hash the sources of this package and the version of pydantic."""
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f"pydantic {pydantic.VERSION}\n".encode("utf-8"))
+    for directory, directories, files in os.walk(package):
+        directories.sort()
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, package).encode("utf-8"))
+            with open(path, "rb") as file:
+                digest.update(file.read())
+    return digest.digest()
@@ -14,25 +14,31 @@ class RegisterGroup:
     length: int
     registers: list[str] | dict[str, int]
 
+    def __post_init__(self) -> None:
+        """Compile the lookup tables of the group."""
+        pairs = (
+            enumerate(self.registers)
+            if isinstance(self.registers, list)
+            else ((index, name) for name, index in self.registers.items())
+        )
+        self._indices: dict[str, int] = {}
+        self._names: dict[int, str] = {}
+        # The first name of a register, or index of a name, is the one kept
+        for index, name in pairs:
+            self._indices.setdefault(name, index)
+            self._names.setdefault(index, name)
+        self.names = "|".join(sorted(self._indices))
+
     def get_register_index(self, register_name: str) -> int | None:
         """Get the index of a register in the group."""
-        if isinstance(self.registers, list):
-            if register_name not in self.registers:
-                return None
-            return self.registers.index(register_name)
-        else:
-            return self.registers.get(register_name)
+        return self._indices.get(register_name)
 
     def __getitem__(self, index: int) -> str:
         """Get the register name at the given index."""
-        if isinstance(self.registers, list):
-            return self.registers[index]
-        else:
-            return next(
-                register_name
-                for register_name, register_index in self.registers.items()
-                if register_index == index
-            )
+        try:
+            return self._names[index]
+        except KeyError:
+            raise IndexError(f"No register with index {index}") from None
 
 
 @dataclass
@@ -1,4 +1,6 @@
 """Disassemble a binary file into a list of instructions."""
+from typing import Iterator
+
 from monistode_binutils_shared import Section
 from monistode_binutils_shared.object_manager import ObjectManager
 from monistode_binutils_shared.section.relocation_table import RelocationTable
@@ -13,15 +15,27 @@ from .disassemble_text import TextDisassembler
 class Disassembler:
     """A disassembler for the monistode set of ISAs."""
 
-    def __init__(self, configuration: Configuration, binary: bytes) -> None:
+    def __init__(
+        self,
+        configuration: Configuration,
+        binary: bytes,
+        text_disassembler: TextDisassembler | None = None,
+    ) -> None:
         """Initialize a disassembler for the given description.
 
         Args:
             configuration: The description of the ISA.
             binary: The binary file to disassemble.
+            text_disassembler: A disassembler for text sections of the ISA
+                to re-use, instead of building its decode plans again.
         """
         self._configuration = configuration
         self._object_manager = ObjectManager.from_bytes(binary)
+        self._text_disassembler = (
+            TextDisassembler(configuration)
+            if text_disassembler is None
+            else text_disassembler
+        )
 
     def disassemble_header(self) -> str:
         return self._object_manager.summary()
@@ -51,6 +65,38 @@ class Disassembler:
             [self.disassemble_header()] + sections_disassembled_formatted
         )
 
+    def disassemble_lines(self, column_width: int | None = None) -> Iterator[str]:
+        """Disassemble a binary file line by line, as it is decoded.
+
+        Unlike disassemble, the notes of the text section are aligned to
+        a fixed column instead of the longest instruction, so nothing has
+        to be decoded ahead of the line being produced.
+
+        Args:
+            column_width: The width to pad instructions to. Defaults to
+                an estimate derived from the ISA.
+
+        Yields:
+            The lines of the disassembly, without line endings.
+        """
+        yield self.disassemble_header()
+        for section in self._object_manager._sections:
+            yield ""
+            if isinstance(section, Text):
+                yield f".{section.name}"
+                yield from self._text_disassembler.disassemble_lines(
+                    section, column_width
+                )
+            elif isinstance(section, SymbolTable):
+                yield f".{section.name}"
+                yield from self._symbol_lines(section)
+            elif isinstance(section, RelocationTable):
+                yield f".{section.name}"
+                yield from self._relocation_lines(section)
+            else:
+                yield f".{section.name} # (not disassembled)"
+                yield from self._raw_lines(section)
+
     def raw_display(self, section: Section) -> str:
         """Display a section of a binary file as raw bytes.
 
@@ -60,12 +106,32 @@ class Disassembler:
         Returns:
             The raw bytes of the section.
         """
-        lines = []
-        for i, byte in enumerate(section.data):
-            if i % 16 == 0:
-                lines.append(f"{i:08x}:")
-            lines[-1] += f" {byte:02x}"
-        return "\n".join(lines)
+        return "\n".join(self._raw_lines(section))
+
+    def _raw_lines(self, section: Section) -> Iterator[str]:
+        """Display a section as raw bytes, sixteen per line."""
+        data = section.data
+        for i in range(0, len(data), 16):
+            yield f"{i:08x}: " + " ".join(f"{byte:02x}" for byte in data[i : i + 16])
+
+    def _symbol_lines(self, section: SymbolTable) -> Iterator[str]:
+        """Display a symbol table, a symbol per line."""
+        for symbol in section:
+            yield (
+                f"{symbol.location.section.rjust(10)}:{symbol.location.offset:08x}"
+                f"        {symbol.name}"
+            )
+
+    def _relocation_lines(self, section: RelocationTable) -> Iterator[str]:
+        """Display a relocation table, a relocation per line."""
+        for relocation in section:
+            yield (
+                f"{relocation.location.section.rjust(10)}:"
+                f"{relocation.location.offset:08x}"
+                f" + {relocation.offset}bits ({relocation.size}-bit) -> "
+                f"{relocation.symbol.name}, "
+                + ("relative" if relocation.relative else "absolute")
+            )
 
     def disassemble_section(self, section: Section) -> str | Section:
         """Disassemble a section of a binary file into a list of instructions.
@@ -77,19 +143,9 @@ class Disassembler:
             The disassembled section.
         """
         if isinstance(section, Text):
-            return TextDisassembler(self._configuration).disassemble(section)
+            return self._text_disassembler.disassemble(section)
         if isinstance(section, SymbolTable):
-            return "\n".join(
-                f"{symbol.location.section.rjust(10)}:{symbol.location.offset:08x}"
-                f"        {symbol.name}"
-                for symbol in section
-            )
+            return "\n".join(self._symbol_lines(section))
         if isinstance(section, RelocationTable):
-            return "\n".join(
-                f"{relocation.location.section.rjust(10)}:{relocation.location.offset:08x}"
-                f" + {relocation.offset}bits ({relocation.size}-bit) -> "
-                f"{relocation.symbol.name}, "
-                + ("relative" if relocation.relative else "absolute")
-                for relocation in section
-            )
+            return "\n".join(self._relocation_lines(section))
         return section
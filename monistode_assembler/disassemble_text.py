@@ -1,45 +1,45 @@
 """A disassembler for the text section of a monistode binary."""
-from typing import Iterator
+from dataclasses import dataclass
+from typing import Callable, Iterator, Sequence
 
 from monistode_binutils_shared.relocation import SymbolRelocation
 from monistode_binutils_shared.section.text import Text
 
-from monistode_assembler.exceptions import DisassemblyError
+from monistode_assembler.exceptions import AssemblyError, DisassemblyError
 
+from .command_description import ConfigurationCommand
 from .description import Configuration
+from .packing import lazy_bytes
+from .relocation_index import RelocationIndex
 
 
-class AnnotatedIterator(Iterator[int]):
-    """An iterator with an annotation for the current address
-    and the bytes we are iterating over."""
+@dataclass(frozen=True)
+class ArgumentDecoder:
+    """Where an argument lies in its command, and how to format it."""
 
-    def __init__(self, iterator: Iterator[int], start_address: int = 0) -> None:
-        """Initialize an annotated iterator.
+    to_string: Callable[[int, list[SymbolRelocation], int, Configuration], str]
+    shift: int
+    mask: int
+    byte_offset: int
+    byte_length: int
+    end_of_command_offset: int
 
-        Args:
-            iterator: The iterator to annotate.
-            start_address: The address of the first byte.
-        """
-        self.iterator = iterator
-        self.address = start_address
-        self.bytes: list[int] = []
 
-    def __next__(self) -> int:
-        """Get the next element of the iterator."""
-        self.address += 1
-        item = next(self.iterator)
-        self.bytes.append(item)
-        return item
+@dataclass(frozen=True)
+class DecodePlan:
+    """How to decode a command, precomputed from its description.
 
-    def pop(self) -> list[int]:
-        """Pop the bytes that were iterated over."""
-        popped = self.bytes
-        self.bytes = []
-        return popped
+    Attributes:
+        mnemonic: The mnemonic of the command.
+        length: The number of bytes the command takes up.
+        arguments: The decoders of the arguments, in order.
+        error: Why the command cannot be decoded, if it cannot.
+    """
 
-    def __iter__(self) -> Iterator[int]:
-        """Get the iterator."""
-        return self
+    mnemonic: str
+    length: int
+    arguments: tuple[ArgumentDecoder, ...]
+    error: str | None = None
 
 
 class TextDisassembler:
@@ -50,60 +50,136 @@ class TextDisassembler:
 
         Args:
             configuration: The description of the ISA.
+
+        Raises:
+            DisassemblyError: If two different commands share an opcode.
         """
         self.configuration = configuration
+        self._instructions_till_opcode = self.get_instructions_till_opcode()
+        self._opcode_shift = (
+            configuration.text_byte_length * self._instructions_till_opcode
+            - configuration.opcode_offset
+            - configuration.opcode_length
+        )
+        self._opcode_mask = (1 << configuration.opcode_length) - 1
+        self._decode_plans = self._build_decode_plans()
 
     def disassemble(self, section: Text) -> str:
-        symbols = section.symbols
-        instructions = AnnotatedIterator(iter(section))
-        disassembly: list[str] = []
-        notes: list[str] = []
-        addresses: list[int] = []
-        symbols = section.symbols
-        used_symbols: list[list[str]] = []
-        while True:
-            try:
-                addresses.append(instructions.address)
-                disassembly.append(
-                    self._disassemble(
-                        instructions, instructions.address, section.relocations
-                    )
-                )
-                notes.append(
-                    " ".join(self.pprint_byte(byte) for byte in instructions.pop())
-                )
-                new_symbols = [
-                    symbol.name
-                    for symbol in symbols
-                    if symbol.location.offset < instructions.address
-                ]
-                used_symbols.append(new_symbols)
-                symbols = [
-                    symbol for symbol in symbols if symbol.name not in new_symbols
-                ]
-            except StopIteration:
-                break
+        """Disassemble a text section, aligning the notes to the longest line.
 
-        max_disassembly_length = (
-            max(len(line) for line in disassembly) if disassembly else 0
+        Args:
+            section: The section to disassemble.
+        """
+        decoded = list(self._decode(section))
+        max_disassembly_length = max(
+            (len(line_disassembly) for _, _, line_disassembly, _ in decoded),
+            default=0,
         )
         output: list[str] = []
-        for new_symbols, address, line_disassembly, note in zip(
-            used_symbols, addresses, disassembly, notes
-        ):
+        for new_symbols, address, line_disassembly, note in decoded:
             output.append(
                 "\n".join(
                     [f"    {symbol}:" for symbol in new_symbols]
                     + [
-                        hex(address)[2:].zfill(
-                            -(-self.configuration.text_address_size // 4)
+                        self._format_instruction(
+                            address, line_disassembly, note, max_disassembly_length
                         )
-                        + f": {line_disassembly.ljust(max_disassembly_length)} # {note}"
                     ]
                 )
             )
         return "\n".join(output)
 
+    def disassemble_lines(
+        self, section: Text, column_width: int | None = None
+    ) -> Iterator[str]:
+        """Disassemble a text section line by line, as the instructions are decoded.
+
+        Args:
+            section: The section to disassemble.
+            column_width: The width to pad the instructions to before their
+                notes. Defaults to an estimate derived from the ISA.
+        """
+        if column_width is None:
+            column_width = self.column_width()
+        for new_symbols, address, line_disassembly, note in self._decode(section):
+            for symbol in new_symbols:
+                yield f"    {symbol}:"
+            yield self._format_instruction(
+                address, line_disassembly, note, column_width
+            )
+
+    def column_width(self) -> int:
+        """Estimate the width of the longest disassembled instruction.
+
+        Every argument is given room for its largest value and a few
+        characters of decoration; symbol names may still exceed it.
+        """
+        return max(
+            (
+                len(command.mnemonic)
+                + sum(
+                    len(str((1 << argument.length_bits(self.configuration)) - 1)) + 6
+                    for argument in command.arguments
+                )
+                for command in self.configuration.commands
+            ),
+            default=0,
+        )
+
+    def _decode(self, section: Text) -> Iterator[tuple[list[str], int, str, str]]:
+        """Decode the instructions of a text section one by one.
+
+        Yields:
+            The names of the symbols placed before the instruction, its address,
+            its disassembly and a note with its raw bytes.
+        """
+        # The section is unpacked an instruction at a time, so that streaming
+        # it takes memory for the packed data only
+        instructions = lazy_bytes(section.data, section.byte, len(section))
+        symbols = sorted(
+            enumerate(section.symbols), key=lambda symbol: symbol[1].location.offset
+        )
+        next_symbol = 0
+        emitted_names: set[str] = set()
+        relocations = RelocationIndex(section.relocations)
+        address = 0
+        while True:
+            try:
+                line_disassembly, length = self._disassemble(
+                    instructions, address, relocations
+                )
+            except StopIteration:
+                break
+            note = " ".join(
+                self.pprint_byte(byte)
+                for byte in instructions[address : address + length]
+            )
+            passed_symbol = next_symbol
+            while (
+                next_symbol < len(symbols)
+                and symbols[next_symbol][1].location.offset < address + length
+            ):
+                next_symbol += 1
+            # Symbols are listed in their original order, and a name is only
+            # listed at the first instruction it precedes
+            new_symbols = [
+                symbol.name
+                for _, symbol in sorted(symbols[passed_symbol:next_symbol])
+                if symbol.name not in emitted_names
+            ]
+            emitted_names.update(new_symbols)
+            yield new_symbols, address, line_disassembly, note
+            address += length
+
+    def _format_instruction(
+        self, address: int, line_disassembly: str, note: str, column_width: int
+    ) -> str:
+        """Format a disassembled instruction with its address and note."""
+        return (
+            hex(address)[2:].zfill(-(-self.configuration.text_address_size // 4))
+            + f": {line_disassembly.ljust(column_width)} # {note}"
+        )
+
     def pprint_byte(self, byte: int) -> str:
         """Pretty print the given byte, taking into account the
         esoteric weirdness that might make it 6 bits long.
@@ -114,89 +190,126 @@ class TextDisassembler:
 
     def _disassemble(
         self,
-        instructions: Iterator[int],
+        instructions: Sequence[int],
         command_address: int,
-        relocations: list[SymbolRelocation],
-    ) -> str:
-        """Disassemble the given instruction.
+        relocations: RelocationIndex,
+    ) -> tuple[str, int]:
+        """Disassemble the instruction at the given address.
 
         Args:
-            instructions: The instructions to disassemble.
+            instructions: The bytes of the section.
+            command_address: The address of the instruction.
+            relocations: The relocations of the section.
+
+        Returns:
+            The disassembly of the instruction and its length in bytes.
+
+        Raises:
+            StopIteration: If the section ends before the instruction does.
         """
-        instructions_till_opcode = self.get_instructions_till_opcode()
-        command_instructions = [
-            next(instructions) for _ in range(instructions_till_opcode)
-        ]
-        extracted_opcode = self.extract_opcode(command_instructions)
-        for command in self.configuration.commands:
-            if command.opcode == extracted_opcode:
-                arg_strings: list[str] = []
-                offset: int = 0
-                n_pre_opcode_arguments = command.get_n_pre_opcode_arguments(
-                    self.configuration.opcode_offset, self.configuration
-                )
-                command_length = (
-                    sum(
-                        argument.length_bits(self.configuration)
-                        for argument in command.arguments
-                    )
-                    + self.configuration.opcode_length
+        opcode_end = command_address + self._instructions_till_opcode
+        if opcode_end > len(instructions):
+            raise StopIteration
+        extracted_opcode = (
+            self.instructions_to_command(instructions[command_address:opcode_end])
+            >> self._opcode_shift
+        ) & self._opcode_mask
+        plan = self._decode_plans.get(extracted_opcode)
+        if plan is None:
+            raise DisassemblyError(f"Unknown opcode: {extracted_opcode}")
+        command_end = command_address + plan.length
+        if command_end > len(instructions):
+            raise StopIteration
+        command = self.instructions_to_command(
+            instructions[command_address:command_end]
+        )
+        arg_strings: list[str] = []
+        for argument in plan.arguments:
+            # Find all relocations that cover this argument or part of it.
+            # (yes, this does mean that labels are not always disassembled
+            # correctly, but that's a feature, not a bug)
+            arg_start = command_address + argument.byte_offset
+            relocations_for_argument = relocations.covering(
+                arg_start, arg_start + argument.byte_length
+            )
+            arg_strings.append(
+                argument.to_string(
+                    (command >> argument.shift) & argument.mask,
+                    relocations_for_argument,
+                    argument.end_of_command_offset,
+                    self.configuration,
                 )
-                if n_pre_opcode_arguments == 0:
-                    offset += self.configuration.opcode_length
-                for i, argument in enumerate(command.arguments):
-                    offset += argument.length_bits(self.configuration)
-                    while offset > self.configuration.text_byte_length * len(
-                        command_instructions
-                    ):
-                        command_instructions.append(next(instructions))
-
-                    argument_value = self.extract_argument(
-                        self.instructions_to_command(command_instructions),
-                        len(command_instructions),
-                        offset - argument.length_bits(self.configuration),
-                        argument.length_bits(self.configuration),
-                    )
-                    # Find all relocations that cover this argument or part of it.
-                    # (yes, this does mean that labels are not always disassembled
-                    # correctly, but that's a feature, not a bug)
-                    arg_start = command_address + (
-                        (offset - argument.length_bits(self.configuration))
-                        // self.configuration.text_byte_length
-                    )
-                    relocations_for_argument = [
-                        relocation
-                        for relocation in relocations
-                        if relocation.location.offset
-                        in range(
-                            arg_start,
-                            arg_start
-                            + argument.length_bits(self.configuration)
-                            // self.configuration.text_byte_length,
-                        )
-                    ]
-                    arg_strings.append(
-                        argument.to_string(
-                            argument_value,
-                            relocations_for_argument,
-                            (
-                                offset
-                                - argument.length_bits(self.configuration)
-                                - command_length
-                            )
-                            // self.configuration.text_byte_length,
-                            self.configuration,
-                        )
-                    )
+            )
+        if plan.error is not None:
+            raise DisassemblyError(plan.error)
+        return f"{plan.mnemonic} {' '.join(arg_strings)}", plan.length
+
+    def _build_decode_plans(self) -> dict[int, DecodePlan]:
+        """Compile the commands of the configuration into decode plans.
 
-                    if i == n_pre_opcode_arguments - 1:
-                        offset += self.configuration.opcode_length
-                if offset % self.configuration.text_byte_length:
+        Raises:
+            DisassemblyError: If two different commands share an opcode.
+        """
+        plans: dict[int, DecodePlan] = {}
+        commands: dict[int, ConfigurationCommand] = {}
+        for command in self.configuration.commands:
+            if command.opcode in commands:
+                if commands[command.opcode].arguments != command.arguments:
                     raise DisassemblyError(
-                        f"Command {command.mnemonic} is not aligned properly."
+                        f"Commands {commands[command.opcode].mnemonic} and "
+                        f"{command.mnemonic} share the opcode {command.opcode}"
                     )
-                return f"{command.mnemonic} {' '.join(arg_strings)}"
-        raise DisassemblyError(f"Unknown opcode: {extracted_opcode}")
+                continue
+            commands[command.opcode] = command
+            plans[command.opcode] = self._build_decode_plan(command)
+        return plans
+
+    def _build_decode_plan(self, command: ConfigurationCommand) -> DecodePlan:
+        """Compile a single command into a decode plan."""
+        byte = self.configuration.text_byte_length
+        opcode_length = self.configuration.opcode_length
+        lengths = [
+            argument.length_bits(self.configuration) for argument in command.arguments
+        ]
+        command_length = sum(lengths) + opcode_length
+        try:
+            n_pre_opcode_arguments = command.get_n_pre_opcode_arguments(
+                self.configuration.opcode_offset, self.configuration
+            )
+        except AssemblyError as error:
+            return DecodePlan(command.mnemonic, 0, (), str(error))
+
+        offset = 0 if n_pre_opcode_arguments else opcode_length
+        starts: list[int] = []
+        for i, length in enumerate(lengths):
+            starts.append(offset)
+            offset += length
+            if i == n_pre_opcode_arguments - 1:
+                offset += opcode_length
+        arguments_end = max(
+            (start + length for start, length in zip(starts, lengths)), default=0
+        )
+        size = max(self._instructions_till_opcode, -(-arguments_end // byte))
+        return DecodePlan(
+            command.mnemonic,
+            size,
+            tuple(
+                ArgumentDecoder(
+                    argument.to_string,
+                    size * byte - start - length,
+                    (1 << length) - 1,
+                    start // byte,
+                    length // byte,
+                    (start - command_length) // byte,
+                )
+                for argument, start, length in zip(command.arguments, starts, lengths)
+            ),
+            (
+                f"Command {command.mnemonic} is not aligned properly."
+                if offset % byte
+                else None
+            ),
+        )
 
     def get_instructions_till_opcode(self) -> int:
         """Get the number of instructions that will definitely
@@ -205,31 +318,10 @@ class TextDisassembler:
         last_bit = self.configuration.opcode_offset + self.configuration.opcode_length
         return -(-last_bit // self.configuration.text_byte_length)
 
-    def instructions_to_command(self, instructions: list[int]) -> int:
+    def instructions_to_command(self, instructions: Sequence[int]) -> int:
         """Convert the given instructions to a command."""
         command = 0
         for instruction in instructions:
             command <<= self.configuration.text_byte_length
             command |= instruction
         return command
-
-    def extract_opcode(self, instructions: list[int]) -> int:
-        """Extract the opcode from the given instructions."""
-        return self.extract_argument(
-            self.instructions_to_command(instructions),
-            len(instructions),
-            self.configuration.opcode_offset,
-            self.configuration.opcode_length,
-        )
-
-    def extract_argument(
-        self, command: int, command_size: int, offset: int, size: int
-    ) -> int:
-        """Extract an argument from the given command."""
-        trailing_bits: int = (
-            self.configuration.text_byte_length * command_size - offset - size
-        )
-        command >>= trailing_bits
-
-        argument_mask: int = (1 << size) - 1
-        return command & argument_mask
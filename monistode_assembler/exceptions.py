@@ -30,6 +30,15 @@ class AssemblerError(Exception):
             else self.message
         ) + (f"\n{self.line_content}" if self.line_content else "")
 
+    def as_dict(self) -> dict[str, str | int | None]:
+        """Describe the error in a form that can be serialized to JSON."""
+        return {
+            "type": type(self).__name__,
+            "message": self.message,
+            "line_number": self.line_number,
+            "line_content": self.line_content,
+        }
+
 
 class AssemblyError(AssemblerError):
     """An error that occurred while assembling an assembly source file."""
@@ -41,3 +50,20 @@ class DisassemblyError(AssemblerError):
 
 class ParserError(AssemblerError):
     """An error that occurred while parsing an assembly source file."""
+
+
+class AssemblerErrors(AssemblerError):
+    """All the errors that occurred while assembling a program."""
+
+    def __init__(self, errors: list[AssemblerError]) -> None:
+        """Initialize the error.
+
+        Args:
+            errors: The errors, in the order of the lines they occurred on.
+        """
+        super().__init__(f"{len(errors)} errors occurred while assembling")
+        self.errors = errors
+
+    def __str__(self) -> str:
+        """Return the messages of all errors."""
+        return "\n".join(str(error) for error in self.errors)
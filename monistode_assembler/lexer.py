@@ -0,0 +1,52 @@
+"""Split a line of assembly source code into its tokens."""
+from dataclasses import dataclass
+import re
+
+
+@dataclass(slots=True)
+class LexedLine:
+    """The tokens of a single line of assembly source code.
+
+    The operands are not split any further, as only the argument parsers know
+    where one ends (strings may contain delimiters and comment characters);
+    instead, the offset at which they start is recorded.
+    """
+
+    label: str | None = None
+    section: str | None = None
+    mnemonic: str | None = None
+    operands: int = 0
+
+
+class Lexer:
+    """A single-pass lexer for lines of assembly source code."""
+
+    _line = re.compile(
+        r"""
+        \s*
+        (?:(?P<label>[^\s:\#]+)\s*:)?
+        \s*
+        (?:
+            \.(?P<section>[^\#]*?)\s*(?:\#.*)?$
+            | (?P<mnemonic>[^\s\#]+)
+        )?
+        """,
+        re.VERBOSE | re.DOTALL,
+    )
+
+    def lex(self, line: str) -> LexedLine:
+        """Lex a single line of source code.
+
+        Args:
+            line (str): The line to lex
+
+        Returns:
+            LexedLine: The tokens of the line
+        """
+        match = self._line.match(line)
+        if match is None:
+            return LexedLine()
+        label, section, mnemonic = match.group("label", "section", "mnemonic")
+        if mnemonic is None:
+            return LexedLine(label, section)
+        return LexedLine(label, None, mnemonic.lower(), match.end("mnemonic"))
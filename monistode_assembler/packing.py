@@ -0,0 +1,183 @@
+"""Conversion between packed section data and bytes of any width."""
+from array import array
+from typing import Sequence, overload
+
+
+def byte_buffer(byte: int) -> array:
+    """Create an empty buffer for bytes of the given width.
+
+    Args:
+        byte (int): The width of a byte in bits
+
+    Returns:
+        array: A buffer with the narrowest item type that fits a byte
+    """
+    for typecode in "BHLQ":
+        if byte <= array(typecode).itemsize * 8:
+            return array(typecode)
+    raise ValueError(f"Bytes of {byte} bits are not supported")
+
+
+def extend_buffer(buffer: array, data: Sequence[int]) -> None:
+    """Append bytes to a buffer, copying octets in bulk where possible.
+
+    Args:
+        buffer (array): The buffer to append to
+        data (Sequence[int]): The bytes to append
+    """
+    if buffer.typecode == "B" and isinstance(data, (bytes, bytearray, memoryview)):
+        buffer.frombytes(data)
+    else:
+        buffer.extend(data)
+
+
+def unpack_bytes(data: bytes, byte: int, length: int) -> list[int]:
+    """Unpack the bytes of a section from its packed representation.
+
+    Bytes are packed most significant bit first with no padding between
+    them, so every eight of them take up exactly `byte` octets.
+
+    Args:
+        data (bytes): The packed data
+        byte (int): The width of a byte in bits
+        length (int): The number of bytes to unpack
+
+    Returns:
+        list[int]: The unpacked bytes
+    """
+    if byte == 8:
+        return list(data[:length])
+    mask = (1 << byte) - 1
+    shifts = range(7 * byte, -1, -byte)
+    unpacked: list[int] = []
+    for start in range(0, -(-length * byte // 8), byte):
+        group = int.from_bytes(data[start : start + byte].ljust(byte, b"\0"), "big")
+        unpacked.extend((group >> shift) & mask for shift in shifts)
+    del unpacked[length:]
+    return unpacked
+
+
+class PackedBytes(Sequence[int]):
+    """Bytes of any width, unpacked from their packed representation on access.
+
+    The data is unpacked a window of WINDOW bytes at a time, and only the
+    last window is kept, so reading a section front to back takes memory
+    for a window rather than for the whole section.
+    """
+
+    WINDOW = 4096
+
+    def __init__(self, data: bytes, byte: int, length: int) -> None:
+        """Wrap packed data.
+
+        Args:
+            data (bytes): The packed data
+            byte (int): The width of a byte in bits
+            length (int): The number of bytes in the data
+        """
+        self._data = data
+        self._byte = byte
+        self._length = length
+        self._window_start = 0
+        self._window: list[int] = []
+
+    def __len__(self) -> int:
+        """Get the number of bytes."""
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> int | list[int]:
+        """Unpack a byte, or a slice of bytes."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[position] for position in range(start, stop, step)]
+            return self._unpack(start, stop)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Index out of range")
+        return self._unpack(index, index + 1)[0]
+
+    def _unpack(self, start: int, stop: int) -> list[int]:
+        """Unpack the bytes from start up to stop."""
+        if stop <= start:
+            return []
+        offset = start - self._window_start
+        if offset < 0 or stop - self._window_start > len(self._window):
+            # Windows start at a group of eight bytes, which starts at an octet
+            first = start - start % 8
+            last = min(max(stop, first + self.WINDOW), self._length)
+            self._window = unpack_bytes(
+                self._data[first // 8 * self._byte : -(-last // 8) * self._byte],
+                self._byte,
+                last - first,
+            )
+            self._window_start = first
+            offset = start - first
+        return self._window[offset : offset + stop - start]
+
+
+def lazy_bytes(data: bytes, byte: int, length: int) -> Sequence[int]:
+    """View packed data as a sequence of bytes, without unpacking it all.
+
+    Args:
+        data (bytes): The packed data
+        byte (int): The width of a byte in bits
+        length (int): The number of bytes in the data
+
+    Returns:
+        Sequence[int]: The bytes; octets are viewed in place
+    """
+    if byte == 8:
+        return memoryview(data)[:length]
+    return PackedBytes(data, byte, length)
+
+
+def pack_bytes(values: Sequence[int], byte: int) -> bytes:
+    """Pack bytes of any width into their contiguous representation.
+
+    Args:
+        values (Sequence[int]): The bytes to pack
+        byte (int): The width of a byte in bits
+
+    Returns:
+        bytes: The packed data, padded with zero bits to a whole octet
+    """
+    if byte == 8:
+        return bytes(values)
+    packed = bytearray()
+    for start in range(0, len(values), 8):
+        group = 0
+        for value in values[start : start + 8]:
+            group = group << byte | value
+        group <<= (8 - len(values[start : start + 8])) * byte
+        packed += group.to_bytes(byte, "big")
+    del packed[-(-len(values) * byte // 8) :]
+    return bytes(packed)
+
+
+def split_bytes(value: int, byte: int, length: int) -> tuple[int, ...]:
+    """Split an integer into bytes of any width, most significant first.
+
+    Args:
+        value (int): The integer to split
+        byte (int): The width of a byte in bits
+        length (int): The number of bytes to split the integer into
+
+    Returns:
+        tuple[int, ...]: The bytes of the integer
+    """
+    if byte == 8:
+        return tuple(value.to_bytes(length, "big"))
+    mask = (1 << byte) - 1
+    return tuple(
+        (value >> shift) & mask for shift in range((length - 1) * byte, -1, -byte)
+    )
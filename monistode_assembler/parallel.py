@@ -0,0 +1,110 @@
+"""Encode the lines of a single large source file in parallel."""
+from concurrent.futures import ProcessPoolExecutor
+import os
+from typing import Collection, Iterator, Sequence
+
+from .compiled import CompiledConfiguration
+from .lexer import Lexer
+from .parse import EncodedChunk, Parser
+
+DEFAULT_CHUNK_LINES = 10000
+
+# The parser of the current worker process, created once by the pool
+# initializer so that the configuration is not sent along with every chunk.
+_worker_parser: Parser | None = None
+
+
+def _initialize_worker(
+    compiled: CompiledConfiguration, keep_going: bool, directory: str
+) -> None:
+    """Create the parser of a worker process."""
+    global _worker_parser
+    _worker_parser = Parser(
+        [parser.fork(directory) for parser in compiled.section_parsers()],
+        keep_going=keep_going,
+    )
+
+
+def _encode_chunk(chunk: tuple[Sequence[str], int, str | None]) -> EncodedChunk:
+    """Encode a chunk of lines in a worker process."""
+    if _worker_parser is None:
+        raise RuntimeError("The worker process was not initialized")
+    return _worker_parser.encode_chunk(*chunk)
+
+
+def chunk_sections(
+    lines: Sequence[str], chunk_lines: int, section_names: Collection[str]
+) -> list[str | None]:
+    """Find the section each chunk of lines starts in.
+
+    Only lines that could switch sections are lexed, so this pass is
+    much cheaper than encoding the lines.
+
+    Args:
+        lines: The lines of the source file.
+        chunk_lines: The number of lines in a chunk.
+        section_names: The names of the sections; switching to any other
+            section fails, so it leaves the current section unchanged.
+    """
+    lexer = Lexer()
+    sections: list[str | None] = []
+    section: str | None = None
+    for number, line in enumerate(lines):
+        if number % chunk_lines == 0:
+            sections.append(section)
+        if "." in line:
+            switch = lexer.lex(line).section
+            if switch in section_names:
+                section = switch
+    return sections
+
+
+def encode_parallel(
+    compiled: CompiledConfiguration,
+    lines: Sequence[str],
+    processes: int | None = None,
+    chunk_lines: int = DEFAULT_CHUNK_LINES,
+    keep_going: bool = False,
+    directory: str = "",
+) -> Iterator[EncodedChunk]:
+    """Encode the lines of a source file in chunks with a pool of processes.
+
+    Args:
+        compiled: The compiled configuration to encode with.
+        lines: The lines of the source file.
+        processes: The number of worker processes; defaults to the number
+            of CPUs. With a single process the lines are encoded in this
+            process.
+        chunk_lines: The number of lines in a chunk.
+        keep_going: Whether to keep encoding the lines after one that fails.
+        directory: The directory of the source file, which the paths in it
+            are relative to; defaults to the working directory.
+
+    Yields:
+        The encoded chunks, in the order of the lines.
+    """
+    section_parsers = [parser.fork(directory) for parser in compiled.section_parsers()]
+    section_names = {parser.section_name for parser in section_parsers}
+    chunks = [
+        (lines[start : start + chunk_lines], start, section)
+        for start, section in zip(
+            range(0, len(lines), chunk_lines),
+            chunk_sections(lines, chunk_lines, section_names),
+        )
+    ]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(chunks) <= 1:
+        parser = Parser(section_parsers, keep_going=keep_going)
+        for chunk in chunks:
+            yield parser.encode_chunk(*chunk)
+        return
+    pool = ProcessPoolExecutor(
+        processes,
+        initializer=_initialize_worker,
+        initargs=(compiled, keep_going, directory),
+    )
+    try:
+        yield from pool.map(_encode_chunk, chunks)
+    finally:
+        # Chunks after a failing one are not needed
+        pool.shutdown(cancel_futures=True)
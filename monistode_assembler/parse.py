@@ -1,12 +1,86 @@
 """Parse an asembly source file into a list of instructions."""
-import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence
 
 from monistode_binutils_shared import Section
 
-from .arguments import Argument, MatchingParser
+from .arguments import Argument, MatchingParser, OperandCache
 from .command import Command
 from .exceptions import AssemblerError, ParserError
-from .sections import SectionParser
+from .lexer import Lexer
+from .sections import Fragment, SectionParser
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedLine:
+    """The effect of a single line of source code on the sections."""
+
+    label: str | None = None
+    section: str | None = None
+    fragment: Fragment | None = None
+
+
+@dataclass
+class EncodedChunk:
+    """Consecutive lines of a source file, encoded apart from the rest of it.
+
+    A line that fails to encode is represented by its error, to be raised
+    once the lines before it have been added to the sections. Unless the
+    parser keeps going after errors, encoding stops at that line.
+    """
+
+    start: int
+    parsed: list[ParsedLine | Exception]
+
+
+def source_lines(source: str | Iterable[str]) -> Iterator[str]:
+    """Iterate over the lines of a source, without their line endings."""
+    if isinstance(source, str):
+        yield from source.splitlines()
+        return
+    for line in source:
+        yield line.rstrip("\r\n")
+
+
+class LineCache:
+    """Parsed lines of one parse, kept for re-use by the next one.
+
+    Lines are keyed by their text and the section they are in, as that
+    is all their encoding depends on; lines whose fragment is not reusable
+    are never stored. Lines that were not seen during a parse are dropped
+    when the cache is rotated.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._previous: dict[tuple[str | None, str], ParsedLine] = {}
+        self._current: dict[tuple[str | None, str], ParsedLine] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, section: str | None, line: str) -> ParsedLine | None:
+        """Get a line parsed in the previous or the current parse."""
+        key = (section, line)
+        parsed = self._current.get(key)
+        if parsed is None:
+            parsed = self._previous.get(key)
+            if parsed is None:
+                self.misses += 1
+                return None
+            self._current[key] = parsed
+        self.hits += 1
+        return parsed
+
+    def put(self, section: str | None, line: str, parsed: ParsedLine) -> None:
+        """Store a line parsed in the current parse."""
+        self._current[(section, line)] = parsed
+
+    def rotate(self) -> None:
+        """Finish the current parse, forgetting lines it did not contain."""
+        self._previous = self._current
+        self._current = {}
+        self.hits = 0
+        self.misses = 0
 
 
 class Parser:
@@ -15,20 +89,93 @@ class Parser:
     def __init__(
         self,
         section_parsers: list[SectionParser],
+        line_cache: LineCache | None = None,
+        keep_going: bool = False,
+        operand_cache: OperandCache | None = None,
     ) -> None:
-        """Initialize the parser."""
+        """Initialize the parser.
+
+        Args:
+            section_parsers: The parsers for the sections of the source.
+            line_cache: Lines parsed by a previous parser to re-use
+                instead of parsing them again.
+            keep_going: Whether to record errors in errors and skip the lines
+                they occurred on, instead of stopping at the first one.
+            operand_cache: The cache of operand scans to use; defaults to
+                a cache of the default size.
+        """
         self._section_parsers = section_parsers
+        self._line_cache = line_cache
+        self._keep_going = keep_going
+        self.errors: list[AssemblerError] = []
+        self._section_parsers_by_name = {
+            parser.section_name: parser for parser in section_parsers
+        }
+        self._lexer = Lexer()
         self._argument_parser = MatchingParser()
+        self.operand_cache = OperandCache() if operand_cache is None else operand_cache
         self._current_section_parser: SectionParser | None = None
 
-    def parse(self, source: str) -> list[Section]:
-        for line_number, line in enumerate(source.splitlines()):
+    def parse(self, source: str | Iterable[str]) -> list[Section]:
+        """Parse a source file into sections.
+
+        Args:
+            source: The source code, either as a whole or as an iterable of
+                lines (such as an open file), which is consumed lazily.
+        """
+        for line_number, line in enumerate(source_lines(source)):
             try:
                 self._parse_line(line)
             except AssemblerError as error:
-                error.line_number = line_number
-                error.line_content = line
-                raise error
+                self._report(error, line_number, line)
+        return self.generate_sections()
+
+    def encode_chunk(
+        self, lines: Sequence[str], start: int, section: str | None
+    ) -> EncodedChunk:
+        """Encode consecutive lines without adding them to the sections.
+
+        Args:
+            lines: The lines to encode.
+            start: The number of the first line.
+            section: The section the first line is in.
+        """
+        parsed: list[ParsedLine | Exception] = []
+        self._current_section_parser = (
+            None if section is None else self._get_section_parser(section)
+        )
+        for line in lines:
+            try:
+                parsed_line = self._encode_line(line)
+            except Exception as error:  # Raised in order by parse_encoded
+                parsed.append(error)
+                if self._keep_going and isinstance(error, AssemblerError):
+                    continue
+                break
+            if parsed_line.section is not None:
+                self._current_section_parser = self._get_section_parser(
+                    parsed_line.section
+                )
+            parsed.append(parsed_line)
+        return EncodedChunk(start, parsed)
+
+    def parse_encoded(
+        self, lines: Sequence[str], chunks: Iterable[EncodedChunk]
+    ) -> list[Section]:
+        """Add encoded chunks of a source file to the sections, in order.
+
+        Args:
+            lines: The lines of the source file.
+            chunks: The encoded chunks, covering the lines in order.
+        """
+        for chunk in chunks:
+            for line_number, parsed in enumerate(chunk.parsed, chunk.start):
+                try:
+                    if isinstance(parsed, Exception):
+                        raise parsed
+                    self._apply_line(parsed)
+                except AssemblerError as error:
+                    self._report(error, line_number, lines[line_number])
         return self.generate_sections()
 
     def generate_sections(self) -> list[Section]:
@@ -39,67 +186,61 @@ class Parser:
         # TODO: aggregate relocations and symbols
         return sections
 
+    def _report(self, error: AssemblerError, line_number: int, line: str) -> None:
+        """Attach a line to an error, then raise or record it."""
+        error.line_number = line_number
+        error.line_content = line
+        if not self._keep_going:
+            raise error
+        self.errors.append(error)
+
     def _parse_line(self, line: str) -> None:
-        """Parse the source code into a list of sections."""
-        line = self._clean_line(line)
-        if not line:
-            return
-        section_name = self._parse_section_name(line)
-        if section_name is not None:
-            self._current_section_parser = self._get_section_parser(section_name)
-            return
-        label = self._parse_label(line)
-        if label is not None:
-            self._add_label(label)
-            self._parse_line(line[0 if label is None else len(label) + 1 :])
+        """Parse a single line of source code."""
+        if self._line_cache is None:
+            self._apply_line(self._encode_line(line))
             return
-        command = self._parse_command(line)
-        if command is None or command.startswith("#"):
-            return
-        command = command.lower()
-        arguments = self._parse_arguments(command, line[len(command) :])
-        self._add_command(Command(command, arguments))
+        section = (
+            None
+            if self._current_section_parser is None
+            else self._current_section_parser.section_name
+        )
+        parsed = self._line_cache.get(section, line)
+        if parsed is None:
+            parsed = self._encode_line(line)
+            if parsed.fragment is None or parsed.fragment.reusable:
+                self._line_cache.put(section, line, parsed)
+        self._apply_line(parsed)
+
+    def _encode_line(self, line: str) -> ParsedLine:
+        """Parse and encode a line, without adding it to the sections."""
+        tokens = self._lexer.lex(line)
+        if tokens.section is not None:
+            self._get_section_parser(tokens.section)
+            return ParsedLine(tokens.label, tokens.section)
+        if tokens.mnemonic is None:
+            return ParsedLine(tokens.label)
+        arguments = self._parse_arguments(tokens.mnemonic, line, tokens.operands)
+        return ParsedLine(
+            tokens.label,
+            None,
+            self._encode_command(Command(tokens.mnemonic, arguments)),
+        )
+
+    def _apply_line(self, parsed: ParsedLine) -> None:
+        """Add a parsed line to the sections."""
+        if parsed.label is not None:
+            self._add_label(parsed.label)
+        if parsed.section is not None:
+            self._current_section_parser = self._get_section_parser(parsed.section)
+        if parsed.fragment is not None:
+            self._append_fragment(parsed.fragment)
 
     def _get_section_parser(self, section_name: str) -> SectionParser:
         """Get the parser for a section."""
-        for parser in self._section_parsers:
-            if parser.section_name == section_name:
-                return parser
-        raise ParserError(f"Unknown section name: {section_name}")
-
-    def _clean_line(self, line: str) -> str:
-        """Clean a line of source code."""
-        return line.strip()
-
-    def _find_whitespace(self, line: str, start: int = 0) -> int:
-        """Find the next whitespace character in a string."""
-        result = re.search(r"\s", line[start:])
-        if result is None:
-            return -1
-        return result.start() + start
-
-    def _strip_comments(self, line: str, start: int = 0) -> str:
-        """Strip comments from a line of source code."""
-        result = re.search(r"#", line[start:])
-        if result is None:
-            return line
-        return line[: result.start()]
-
-    def _parse_section_name(self, line: str) -> str | None:
-        """Parse the name of a section."""
-        if line.startswith("."):
-            return self._strip_comments(line[1:])
-        return None
-
-    def _parse_label(self, line: str) -> str | None:
-        """Parse a label."""
-        first_whitespace = self._find_whitespace(line)
-        if first_whitespace == -1:
-            if line.endswith(":"):
-                return line[:-1]
-            return None
-        if line[first_whitespace + 1] == ":":
-            return line[:first_whitespace]
+        parser = self._section_parsers_by_name.get(section_name)
+        if parser is None:
+            raise ParserError(f"Unknown section name: {section_name}")
+        return parser
 
     def _add_label(self, label: str) -> None:
         """Add a label to the current section."""
@@ -107,28 +248,32 @@ class Parser:
             raise ParserError("Label found outside of section")
         self._current_section_parser.add_label(label)
 
-    def _parse_command(self, line: str) -> str | None:
-        """Parse a command."""
-        first_whitespace = self._find_whitespace(line)
-        if "#" in line:
-            first_whitespace = min(line.find("#"), first_whitespace)
-        if first_whitespace == -1:
-            return line
-        if first_whitespace == 0:
-            return None
-        return line[:first_whitespace]
-
     def _parse_arguments(
-        self, command: str, raw_arguments: str
+        self, command: str, line: str, offset: int
     ) -> tuple[Argument, ...]:
         """Parse the arguments of a command."""
         if self._current_section_parser is None:
             raise ParserError("Command found outside of section")
         signatures = self._current_section_parser.command_signatures(command)
-        return self._argument_parser.parse(raw_arguments, signatures)
+        return self._argument_parser.parse(
+            line,
+            signatures,
+            offset,
+            (
+                self.operand_cache
+                if self._current_section_parser.cache_operands
+                else None
+            ),
+        )
+
+    def _encode_command(self, command: Command) -> Fragment:
+        """Encode a command for the current section."""
+        if self._current_section_parser is None:
+            raise ParserError("Command found outside of section")
+        return self._current_section_parser.encode(command)
 
-    def _add_command(self, command: Command) -> None:
-        """Add a command to the current section."""
+    def _append_fragment(self, fragment: Fragment) -> None:
+        """Add an encoded command to the current section."""
         if self._current_section_parser is None:
             raise ParserError("Command found outside of section")
-        self._current_section_parser.add_command(command)
+        self._current_section_parser.append(fragment)
@@ -0,0 +1,51 @@
+"""An index of relocations by the offset they apply to."""
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from monistode_binutils_shared.relocation import SymbolRelocation
+
+
+class RelocationIndex:
+    """Relocations sorted by offset once, looked up by bisection.
+
+    Iterating over the index yields the relocations in their original order,
+    so it can stand in for the list it was built from.
+    """
+
+    def __init__(self, relocations: Iterable[SymbolRelocation]) -> None:
+        """Index the given relocations.
+
+        Args:
+            relocations: The relocations to index.
+        """
+        self._relocations = list(relocations)
+        self._order = sorted(
+            range(len(self._relocations)),
+            key=lambda i: self._relocations[i].location.offset,
+        )
+        self._offsets = [self._relocations[i].location.offset for i in self._order]
+
+    def __len__(self) -> int:
+        """The number of relocations in the index."""
+        return len(self._relocations)
+
+    def __iter__(self) -> Iterator[SymbolRelocation]:
+        """Iterate over the relocations in their original order."""
+        return iter(self._relocations)
+
+    def covering(self, start: int, end: int) -> list[SymbolRelocation]:
+        """Get the relocations applied within a range of offsets.
+
+        Args:
+            start: The first offset of the range.
+            end: The offset just past the range.
+
+        Returns:
+            The relocations whose offset lies in the range, in their
+            original order.
+        """
+        first = bisect_left(self._offsets, start)
+        last = bisect_left(self._offsets, end, first)
+        if last - first == 1:
+            return [self._relocations[self._order[first]]]
+        return [self._relocations[i] for i in sorted(self._order[first:last])]
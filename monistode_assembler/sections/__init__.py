@@ -1,5 +1,5 @@
 """The parsers for the different types of sections."""
 
-from .common import SectionParser
+from .common import Fragment, SectionParser
 
-__all__ = ["SectionParser"]
+__all__ = ["Fragment", "SectionParser"]
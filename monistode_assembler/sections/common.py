@@ -1,28 +1,60 @@
 """Common types for the section parsers."""
-from typing import Protocol, TypeVar
+from dataclasses import dataclass
+from typing import Protocol, Sequence, TypeVar
 
 from monistode_binutils_shared import Section
+from monistode_binutils_shared.relocation import SymbolRelocationParams
 
-from ..arguments import Argument, ArgumentParser
+from ..arguments import Argument, SignatureTrie
 from ..command import Command
 
 
 T = TypeVar("T", bound=Argument)
 
 
+@dataclass(frozen=True)
+class Fragment:
+    """The encoding of a single command, independent of where it is placed.
+
+    Relocations are given as pairs of the byte offset from the start
+    of the command and the relocation parameters. A fragment that depends
+    on more than the text of its line, such as the contents of an included
+    file, is not reusable by later parses of the same line.
+    """
+
+    data: Sequence[int]
+    relocations: tuple[tuple[int, SymbolRelocationParams], ...] = ()
+    reusable: bool = True
+
+
 class SectionParser(Protocol[T]):
     """A parser for a single section of an assembly source file."""
 
     section_name: str
+    # Whether the arguments of the section may be shared between lines
+    # through an operand cache
+    cache_operands: bool
 
-    def command_signatures(
-        self, command: str
-    ) -> tuple[tuple[ArgumentParser[T], ...], ...]:
+    def fork(self, directory: str = "") -> "SectionParser[T]":
+        """Create a parser with the same tables and an empty section.
+
+        Args:
+            directory: The directory of the source file, which the paths
+                in it are relative to; defaults to the working directory.
+        """
+
+    def command_signatures(self, command: str) -> SignatureTrie[T]:
         """Get the possible signatures for a command."""
 
     def add_command(self, command: Command[T]) -> None:
         """Add a command to the section."""
 
+    def encode(self, command: Command[T]) -> Fragment:
+        """Encode a command without adding it to the section."""
+
+    def append(self, fragment: Fragment) -> None:
+        """Add an encoded command to the section."""
+
     def add_label(self, label: str) -> None:
         """Add a label to the section."""
 
@@ -1,11 +1,24 @@
 """The text section parser of the assembler."""
+import copy
 from dataclasses import dataclass
+from typing import Sequence
 
+from monistode_binutils_shared.location import Location
+from monistode_binutils_shared.relocation import (
+    SymbolRelocation,
+    SymbolRelocationParams,
+)
 from monistode_binutils_shared.section.data import Data
 
 from ..arguments.common import ArgumentParser
+from ..arguments.included_binary import IncludedBinary, IncludedBinaryParser
+from ..arguments.numbers import FillParser, NumbersParser
+from ..arguments.signature_trie import SignatureTrie
 from ..arguments.string import StringParser
 from ..command import Command
+from ..exceptions import AssemblyError
+from ..packing import byte_buffer, extend_buffer, pack_bytes
+from .common import Fragment
 from .data_argument import DataArgument
 
 
@@ -21,36 +34,122 @@ class DataSectionParser:
     """The data section parser of the assembler."""
 
     section_name = "data"
+    # Data arguments can be long, and included files can change between parses
+    cache_operands = False
 
     def __init__(self, parameters: DataSectionParameters) -> None:
         """Initialize the data section parser."""
         self.parameters = parameters
-        self.data = Data(parameters.byte)
+        # The directory paths of included files are relative to
+        self.directory = ""
+        self._start_section()
 
+        # Every line costs a lex and a signature match however few values it
+        # holds, so a table takes an order of magnitude longer to assemble
+        # with a value per line than with its values on one line (see the
+        # data/per-line and data/one-line benchmarks)
         self.signatures: dict[str, tuple[ArgumentParser[DataArgument], ...]] = {
             "ascii": (StringParser(b""),),
             "asciiz": (StringParser(b"\0"),),
+            "incbin": (IncludedBinaryParser(),),
+            "byte": (NumbersParser(1, parameters.byte),),
+            "word": (NumbersParser(2, parameters.byte),),
+            "dword": (NumbersParser(4, parameters.byte),),
+            "fill": (FillParser(parameters.byte),),
+            "zero": (FillParser(parameters.byte, count_only=True),),
         }
+        self._signature_tries = {
+            command: SignatureTrie([signature])
+            for command, signature in self.signatures.items()
+        }
+        self._no_arguments: SignatureTrie[DataArgument] = SignatureTrie([()])
+
+    def fork(self, directory: str = "") -> "DataSectionParser":
+        """Create a parser with the same signatures and an empty section.
+
+        Args:
+            directory: The directory of the source file, which the paths
+                of included files are relative to.
+        """
+        parser = copy.copy(self)
+        parser.directory = directory
+        parser._start_section()
+        return parser
+
+    def _start_section(self) -> None:
+        """Start an empty data section."""
+        self.data = Data(self.parameters.byte)
+        # The bytes of the section, packed into the data section only once
+        # parsing is done since appending to it byte by byte is slow
+        self._data = byte_buffer(self.parameters.byte)
 
-    def command_signatures(
-        self, command: str
-    ) -> tuple[tuple[ArgumentParser, ...], ...]:
+    def command_signatures(self, command: str) -> SignatureTrie[DataArgument]:
         """Get all possible signatures of a command."""
-        return (self.signatures.get(command, ()),)
+        return self._signature_tries.get(command, self._no_arguments)
 
     def add_command(self, command: Command[DataArgument]) -> None:
         """Add a command to the text section."""
-        data_bytes = b""
-        for argument in command.args:
-            data_bytes += argument.asbytes
+        self.append(self.encode(command))
+
+    def encode(self, command: Command[DataArgument]) -> Fragment:
+        """Encode a command without adding it to the data section."""
+        arguments = command.args
+        # An included file can change without the line changing
+        reusable = not any(
+            isinstance(argument, IncludedBinary) for argument in arguments
+        )
+        if not reusable:
+            arguments = tuple(
+                (
+                    argument.relative_to(self.directory)
+                    if isinstance(argument, IncludedBinary)
+                    else argument
+                )
+                for argument in arguments
+            )
+        if len(arguments) == 1 and not arguments[0].symbols:
+            # Hand a single argument over as is, without copying it
+            return Fragment(self._check_bytes(arguments[0].asbytes), reusable=reusable)
+        data = byte_buffer(self.parameters.byte)
+        relocations: list[tuple[int, SymbolRelocationParams]] = []
+        for argument in arguments:
             for symbol in argument.symbols:
-                self.data.add_raw_relocation(symbol)
-        for byte in data_bytes:
-            self.data.add_byte(byte)
+                relocations.append((len(data), symbol))
+            extend_buffer(data, argument.asbytes)
+        return Fragment(self._check_bytes(data), tuple(relocations), reusable)
+
+    def _check_bytes(self, data: Sequence[int]) -> Sequence[int]:
+        """Check that every byte fits in a byte of the data section."""
+        if self.parameters.byte < 8 and max(data, default=0) >> self.parameters.byte:
+            raise AssemblyError(
+                f"Data does not fit in {self.parameters.byte}-bit bytes"
+            )
+        return data
+
+    def append(self, fragment: Fragment) -> None:
+        """Add an encoded command to the data section."""
+        start = len(self._data)
+        for offset, relocation in fragment.relocations:
+            self.data.add_relocation(
+                SymbolRelocation.from_params(
+                    Location(self.data.name, start + offset), relocation
+                )
+            )
+        extend_buffer(self._data, fragment.data)
 
     def add_label(self, label: str) -> None:
-        self.data.add_raw_symbol(label)
+        self.data.add_raw_symbol(label, len(self._data))
 
     def get(self) -> Data:
-        """Finish parsing the data section and return the result."""
+        """Finish parsing the data section and return the result.
+
+        The buffer of the section is handed over and released, since the
+        data section keeps a copy of its own. Octets are handed over as
+        they are, without packing them into yet another copy.
+        """
+        data, self._data = self._data, byte_buffer(self.parameters.byte)
+        if self.parameters.byte == 8:
+            self.data.from_bytes(data, len(data))
+        else:
+            self.data.from_bytes(pack_bytes(data, self.parameters.byte), len(data))
         return self.data
@@ -1,5 +1,5 @@
 """The text section argument protocol"""
-from typing import Protocol
+from typing import Protocol, Sequence
 
 from monistode_binutils_shared.relocation import SymbolRelocationParams
 
@@ -11,8 +11,8 @@ class DataArgument(Protocol):
     type_name: str
 
     @property
-    def asbytes(self) -> bytes:
-        """The argument as bytes"""
+    def asbytes(self) -> Sequence[int]:
+        """The argument as bytes of the data section"""
 
     @property
     def symbols(self) -> tuple[SymbolRelocationParams, ...]:
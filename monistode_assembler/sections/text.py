@@ -1,12 +1,20 @@
 """The text section parser of the assembler."""
+import copy
 from dataclasses import dataclass
 
-from monistode_binutils_shared.relocation import SymbolRelocationParams
+from monistode_binutils_shared.location import Location
+from monistode_binutils_shared.relocation import (
+    SymbolRelocation,
+    SymbolRelocationParams,
+)
 from monistode_binutils_shared.section.text import Text
 
 from ..arguments.common import ArgumentParser
+from ..arguments.signature_trie import SignatureTrie
 from ..command import Command
 from ..exceptions import AssemblyError
+from ..packing import byte_buffer, pack_bytes, split_bytes
+from .common import Fragment
 from .text_argument import TextArgument
 
 
@@ -20,6 +28,42 @@ class CommandDefinition:
     pre_opcode_arguments: int
 
 
+@dataclass(frozen=True)
+class FieldTemplate:
+    """Where an argument lies in an encoded command.
+
+    Attributes:
+        start: The offset of the argument from the start of the command in bits.
+        shift: The offset of the argument from the end of the command in bits.
+        mask: The mask of the bits of the argument.
+        byte_offset: The byte of the command the argument starts in.
+        bit_offset: The offset of the argument within that byte in bits.
+    """
+
+    start: int
+    shift: int
+    mask: int
+    byte_offset: int
+    bit_offset: int
+
+
+@dataclass(frozen=True)
+class EncodingTemplate:
+    """The layout of a command, computed once per definition.
+
+    Attributes:
+        bits: The length of the command in bits.
+        length: The length of the command in bytes.
+        opcode: The opcode, shifted into place.
+        fields: The layout of every argument, in order.
+    """
+
+    bits: int
+    length: int
+    opcode: int
+    fields: tuple[FieldTemplate, ...]
+
+
 @dataclass
 class TextSectionParameters:
     """The parameters of the text section parser."""
@@ -35,6 +79,7 @@ class TextSectionParser:
     """The text section parser of the assembler."""
 
     section_name = "text"
+    cache_operands = True
 
     def __init__(
         self, parameters: TextSectionParameters, commands: list[CommandDefinition]
@@ -42,109 +87,159 @@ class TextSectionParser:
         """Initialize the text section parser."""
         self.parameters = parameters
         self.commands = commands
-        self.text = Text(parameters.byte)
+        self._start_section()
+        self._templates: dict[
+            tuple[str, tuple[str, ...], tuple[int, ...]], EncodingTemplate
+        ] = {}
 
-    def command_signatures(
-        self, command: str
-    ) -> tuple[tuple[ArgumentParser[TextArgument], ...], ...]:
+        self._signatures: dict[str, SignatureTrie[TextArgument]] = {}
+        self._no_signatures: SignatureTrie[TextArgument] = SignatureTrie()
+        self._definitions: dict[tuple[str, tuple[str, ...]], CommandDefinition] = {}
+        for cmd in commands:
+            key = (cmd.mnemonic, tuple(parser.type_name for parser in cmd.arguments))
+            if key in self._definitions:
+                raise AssemblyError(
+                    f"Ambiguous signatures for {cmd.mnemonic}: "
+                    f"opcodes {self._definitions[key].opcode} and {cmd.opcode} "
+                    f"both take ({', '.join(key[1])})"
+                )
+            self._definitions[key] = cmd
+            self._signatures.setdefault(cmd.mnemonic, SignatureTrie()).add(
+                cmd.arguments
+            )
+
+    def fork(self, directory: str = "") -> "TextSectionParser":
+        """Create a parser with the same tables and an empty section.
+
+        The signatures, definitions and encoding templates are shared, so
+        the fork is cheap and keeps the templates built so far. No text
+        command takes a path, so the directory is not needed.
+        """
+        parser = copy.copy(self)
+        parser._start_section()
+        return parser
+
+    def _start_section(self) -> None:
+        """Start an empty text section."""
+        self.text = Text(self.parameters.byte)
+        # The bytes of the section, packed into the text section only once
+        # parsing is done since appending to it byte by byte is slow
+        self._data = byte_buffer(self.parameters.byte)
+
+    def command_signatures(self, command: str) -> SignatureTrie[TextArgument]:
         """Get all possible signatures of a command."""
-        return tuple(cmd.arguments for cmd in self.commands if cmd.mnemonic == command)
+        return self._signatures.get(command, self._no_signatures)
 
     def configuration_command(
         self, command: str, arguments: tuple[TextArgument, ...]
     ) -> CommandDefinition:
         """Get the configuration of a command."""
-        return next(
-            cmd
-            for cmd in self.commands
-            if cmd.mnemonic == command
-            and len(cmd.arguments) == len(arguments)
-            and all(
-                argument.type_name == argument_parser.type_name
-                for argument, argument_parser in zip(arguments, cmd.arguments)
-            )
+        definition = self._definitions.get(
+            (command, tuple(argument.type_name for argument in arguments))
         )
+        if definition is None:
+            raise AssemblyError(f"No definition of {command} matches its arguments")
+        return definition
 
     def add_command(self, command: Command[TextArgument]) -> None:
         """Add a command to the text section."""
-        configuration_command = self.configuration_command(command.name, command.args)
-        n_pre_opcode_arguments = configuration_command.pre_opcode_arguments
-        command_code: int = 0
-        command_bits: int = 0
-
-        if n_pre_opcode_arguments == 0:
-            command_code = configuration_command.opcode
-            command_bits = self.parameters.opcode_length
-
-        command_bytes = (
-            sum(argument.n_bits for argument in command.args)
-            + self.parameters.opcode_length
-        ) // self.parameters.byte
-        acc_bytes: int = 0
-
-        for i, argument in enumerate(command.args):
-            while command_bits >= self.parameters.byte:
-                offset = (
-                    command_bits % self.parameters.byte
-                    + command_bits // self.parameters.byte * self.parameters.byte
-                    - self.parameters.byte
-                )
-                extracted_byte = command_code >> offset
-                self.text.add_byte(extracted_byte)
-                command_code -= extracted_byte << offset
-                command_bits -= self.parameters.byte
-                acc_bytes += 1
-
-            bit_offset = command_bits % self.parameters.byte
-            overlay_offsets: list[tuple[int, int, int, bool]] = []
+        self.append(self.encode(command))
+
+    def encode(self, command: Command[TextArgument]) -> Fragment:
+        """Encode a command without adding it to the text section."""
+        template = self.encoding_template(command)
+        command_code = template.opcode
+        relocations: list[tuple[int, SymbolRelocationParams]] = []
+        for field, argument in zip(template.fields, command.args):
+            command_code |= (argument.asint & field.mask) << field.shift
             for symbol in argument.symbols:
-                self.text.add_raw_relocation(
-                    SymbolRelocationParams(
-                        symbol.target,
-                        symbol.size,
-                        symbol.offset + bit_offset,
-                        symbol.relative,
-                    )
-                )
-                relocation_byte_offset = acc_bytes - command_bytes
-                overlay_offsets.append(
+                relocations.append(
                     (
-                        symbol.offset + bit_offset,
-                        relocation_byte_offset,
-                        symbol.size,
-                        symbol.relative,
+                        field.byte_offset,
+                        SymbolRelocationParams(
+                            symbol.target,
+                            symbol.size,
+                            symbol.offset + field.bit_offset,
+                            symbol.relative,
+                        ),
                     )
                 )
-
-            command_code <<= argument.n_bits
-            command_code |= argument.asint % 2**argument.n_bits
-            command_bits += argument.n_bits
-
-            for start, offset, size, relative in overlay_offsets:
-                if relative:
+                if symbol.relative:
                     command_code = self.add_overlay(
-                        command_code, command_bits, start, offset, size
+                        command_code,
+                        template.bits,
+                        field.start + symbol.offset,
+                        field.byte_offset - template.length,
+                        symbol.size,
                     )
+        return Fragment(
+            split_bytes(command_code, self.parameters.byte, template.length),
+            tuple(relocations),
+        )
 
-            if i == n_pre_opcode_arguments - 1:
-                command_code <<= self.parameters.opcode_length
-                command_code |= configuration_command.opcode
-                command_bits += self.parameters.opcode_length
+    def encoding_template(self, command: Command[TextArgument]) -> EncodingTemplate:
+        """Get the encoding template of a command, building it on first use.
 
-        while command_bits >= self.parameters.byte:
-            offset = (
-                command_bits % self.parameters.byte
-                + command_bits // self.parameters.byte * self.parameters.byte
-                - self.parameters.byte
+        Templates are cached by the definition of the command and the widths
+        of its arguments, which together fix its layout.
+        """
+        key = (
+            command.name,
+            tuple(argument.type_name for argument in command.args),
+            tuple(argument.n_bits for argument in command.args),
+        )
+        template = self._templates.get(key)
+        if template is None:
+            template = self._build_template(
+                self.configuration_command(command.name, command.args), key[2]
             )
-            extracted_byte = command_code >> offset
-            self.text.add_byte(extracted_byte)
-            command_code -= extracted_byte << offset
-            command_bits -= self.parameters.byte
+            self._templates[key] = template
+        return template
 
-        if command_bits:
+    def _build_template(
+        self, definition: CommandDefinition, widths: tuple[int, ...]
+    ) -> EncodingTemplate:
+        """Lay out the fields of a command with the given argument widths."""
+        byte = self.parameters.byte
+        opcode_length = self.parameters.opcode_length
+        bits = sum(widths) + opcode_length
+        if bits % byte:
             raise AssemblyError(
-                f"Command {command.name} has {command_bits} bits left over"
+                f"Command {definition.mnemonic} has {bits % byte} bits left over"
+            )
+        offset = 0 if definition.pre_opcode_arguments else opcode_length
+        opcode_offset = 0
+        fields: list[FieldTemplate] = []
+        for i, width in enumerate(widths):
+            fields.append(
+                FieldTemplate(
+                    offset,
+                    bits - offset - width,
+                    (1 << width) - 1,
+                    offset // byte,
+                    offset % byte,
+                )
+            )
+            offset += width
+            if i == definition.pre_opcode_arguments - 1:
+                opcode_offset = offset
+                offset += opcode_length
+        return EncodingTemplate(
+            bits,
+            bits // byte,
+            definition.opcode << (bits - opcode_offset - opcode_length),
+            tuple(fields),
+        )
+
+    def append(self, fragment: Fragment) -> None:
+        """Add an encoded command to the text section."""
+        start = len(self._data)
+        self._data.extend(fragment.data)
+        for offset, relocation in fragment.relocations:
+            self.text.add_relocation(
+                SymbolRelocation.from_params(
+                    Location(self.text.name, start + offset), relocation
+                )
             )
 
     def add_overlay(
@@ -167,8 +262,11 @@ class TextSectionParser:
         return (command_code & ~overlay_mask) | (new_value << bits_till_end)
 
     def add_label(self, label: str) -> None:
-        self.text.add_raw_symbol(label)
+        self.text.add_raw_symbol(label, len(self._data))
 
     def get(self) -> Text:
         """Finish parsing the text section and return the result."""
+        self.text.from_bytes(
+            pack_bytes(self._data, self.parameters.byte), len(self._data)
+        )
         return self.text
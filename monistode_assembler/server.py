@@ -0,0 +1,220 @@
+"""A long-running assembler process serving requests over a Unix socket.
+
+Requests and responses are single lines of JSON. A request names the
+command ("assemble" or "disassemble") and the path of the configuration,
+and carries its input inline: the source text to assemble, with the
+directory its included files are relative to, or the base64 encoded
+object file to disassemble. A response is either
+{"ok": true, "result": ...} or {"ok": false, "error": "..."}, where the
+result of an assembly is the base64 encoded object file.
+
+Requests are handled by a pool of worker processes, each of which keeps
+an assembler and a disassembler for every configuration it has loaded.
+"""
+import asyncio
+import base64
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import json
+import os
+import signal
+import socket
+import stat
+from typing import Any, Sequence
+
+from .assemble import Assembler
+from .compiled import CompiledConfiguration
+from .disassemble import Disassembler
+from .disassemble_text import TextDisassembler
+
+
+@dataclass
+class LoadedConfiguration:
+    """A compiled configuration, with an assembler and a disassembler for it.
+
+    Both are built once, when the configuration is loaded, and re-used by
+    every request for it; a worker process handles one request at a time.
+    """
+
+    compiled: CompiledConfiguration
+    assembler: Assembler
+    text_disassembler: TextDisassembler
+
+    @classmethod
+    def load(cls, compiled: CompiledConfiguration) -> "LoadedConfiguration":
+        """Build the assembler and the disassembler of a configuration."""
+        return cls(
+            compiled,
+            Assembler.from_compiled(compiled),
+            TextDisassembler(compiled.configuration),
+        )
+
+
+class ConfigurationStore:
+    """Loaded configurations by path, reloaded when their file changes."""
+
+    def __init__(self, cache_directory: str | None = None) -> None:
+        """Initialize an empty store.
+
+        Args:
+            cache_directory: The directory to cache compiled configurations in.
+        """
+        self._cache_directory = cache_directory
+        self._configurations: dict[
+            str, tuple[tuple[int, int], LoadedConfiguration]
+        ] = {}
+
+    def get(self, path: str) -> LoadedConfiguration:
+        """Get the configuration at a path, reloading it if it changed."""
+        path = os.path.abspath(path)
+        status = os.stat(path)
+        version = (status.st_mtime_ns, status.st_size)
+        cached = self._configurations.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with open(path) as file:
+            compiled = CompiledConfiguration.from_yaml(
+                file.read(), self._cache_directory
+            )
+        loaded = LoadedConfiguration.load(compiled)
+        self._configurations[path] = (version, loaded)
+        return loaded
+
+
+def handle(store: ConfigurationStore, request: dict[str, Any]) -> dict[str, Any]:
+    """Handle a single request with the configurations of a store."""
+    try:
+        loaded = store.get(request["configuration"])
+        if request["command"] == "assemble":
+            assembled = loaded.assembler.assemble(
+                request["source"], request.get("directory", "")
+            )
+            return {"ok": True, "result": base64.b64encode(assembled).decode()}
+        if request["command"] == "disassemble":
+            disassembler = Disassembler(
+                loaded.compiled.configuration,
+                base64.b64decode(request["binary"]),
+                loaded.text_disassembler,
+            )
+            if request.get("header_only"):
+                return {"ok": True, "result": disassembler.disassemble_header()}
+            return {"ok": True, "result": disassembler.disassemble()}
+        return {"ok": False, "error": f"Unknown command: {request['command']}"}
+    except KeyError as error:
+        return {"ok": False, "error": f"Missing request field: {error}"}
+    except Exception as error:  # Keep serving other requests
+        return {"ok": False, "error": str(error) or type(error).__name__}
+
+
+# The configurations of the current worker process, created once by the
+# pool initializer so that every request the worker handles re-uses them.
+_worker_store: ConfigurationStore | None = None
+
+
+def _initialize_worker(
+    cache_directory: str | None, configurations: Sequence[str]
+) -> None:
+    """Create the store of a worker process and load the given configurations."""
+    global _worker_store
+    # Interrupting the server stops the workers through the pool instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_store = ConfigurationStore(cache_directory)
+    for configuration in configurations:
+        try:
+            _worker_store.get(configuration)
+        except Exception:  # Reported by the requests for the configuration
+            pass
+
+
+def _handle_request(request: dict[str, Any]) -> dict[str, Any]:
+    """Handle a single request in a worker process."""
+    if _worker_store is None:
+        raise RuntimeError("The worker process was not initialized")
+    return handle(_worker_store, request)
+
+
+class AssemblerServer:
+    """Serve assembly and disassembly requests over a Unix socket."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        configurations: Sequence[str] = (),
+        cache_directory: str | None = None,
+        workers: int | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            socket_path: The path of the Unix socket to listen on.
+            configurations: The paths of the configurations for every worker
+                to load ahead of its first request; others are loaded by
+                the first request a worker gets for them.
+            cache_directory: The directory to cache compiled configurations in.
+            workers: The number of worker processes handling requests;
+                defaults to the number of CPUs.
+        """
+        self._socket_path = socket_path
+        self._executor = ProcessPoolExecutor(
+            workers,
+            initializer=_initialize_worker,
+            initargs=(
+                cache_directory,
+                [os.path.abspath(path) for path in configurations],
+            ),
+        )
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of a single connection, in order."""
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    response = {"ok": False, "error": f"Malformed request: {error}"}
+                else:
+                    response = await loop.run_in_executor(
+                        self._executor, _handle_request, request
+                    )
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        """Listen on the socket until cancelled."""
+        remove_stale_socket(self._socket_path)
+        server = await asyncio.start_unix_server(
+            self._serve_connection, self._socket_path, limit=1 << 30
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            os.unlink(self._socket_path)
+
+
+def remove_stale_socket(path: str) -> None:
+    """Remove a socket left behind by a server that is no longer running.
+
+    Raises:
+        OSError: If the path exists but is not a socket, or if another
+            server is still listening on the socket.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(f"Another server is already listening on {path}")
@@ -0,0 +1,220 @@
+"""Opt-in instrumentation of the phases of an assembly."""
+from collections import Counter
+from contextlib import contextmanager
+import heapq
+import time
+from typing import Any, Iterator
+
+from .arguments import Argument
+from .command import Command
+from .lexer import LexedLine, Lexer
+from .parse import ParsedLine, Parser
+from .sections import Fragment
+
+
+class AssemblyHooks:
+    """Callbacks invoked while assembling; every one does nothing by default.
+
+    Subclass this and pass an instance to the Assembler to observe an
+    assembly. Lines are only observed one by one when they are parsed
+    serially; parallel assembly reports the phases of the main process.
+    """
+
+    def phase(self, name: str, seconds: float) -> None:
+        """Called when a phase, or one line's share of it, has finished.
+
+        Args:
+            name: The name of the phase.
+            seconds: The wall time it took.
+        """
+
+    def line(self, line_number: int, line: str, seconds: float) -> None:
+        """Called when a line has been parsed and placed into its section.
+
+        Args:
+            line_number: The number of the line.
+            line: The text of the line.
+            seconds: The wall time it took, all phases included.
+        """
+
+    def arguments_matched(self, mnemonic: str, attempts: int, rejected: int) -> None:
+        """Called when the operands of a line have been matched.
+
+        Args:
+            mnemonic: The mnemonic of the line.
+            attempts: The number of times an argument parser was run.
+            rejected: The number of those runs that did not match.
+        """
+
+    def operand_cache(self, hits: int, misses: int, size: int) -> None:
+        """Called when a serial parse is done, with its operand cache counters.
+
+        Args:
+            hits: The number of operand scans answered from the cache.
+            misses: The number of operand scans that ran a parser.
+            size: The number of results in the cache.
+        """
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time a block of code as a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase(name, time.perf_counter() - start)
+
+
+class AssemblyStats(AssemblyHooks):
+    """Hooks that aggregate timings and counters into a report."""
+
+    def __init__(self, slowest_lines: int = 10) -> None:
+        """Initialize empty statistics.
+
+        Args:
+            slowest_lines: The number of slowest lines to keep.
+        """
+        self.phases: Counter[str] = Counter()
+        self.lines = 0
+        self.matched_lines = 0
+        self.signature_attempts = 0
+        self.rejected_candidates: Counter[str] = Counter()
+        self.operand_cache_hits = 0
+        self.operand_cache_misses = 0
+        self.operand_cache_size = 0
+        self._slowest_lines_kept = slowest_lines
+        self._slowest_lines: list[tuple[float, int, str]] = []
+
+    def phase(self, name: str, seconds: float) -> None:
+        """Add the time of a phase."""
+        self.phases[name] += seconds
+
+    def line(self, line_number: int, line: str, seconds: float) -> None:
+        """Count a line, keeping it if it is among the slowest."""
+        self.lines += 1
+        if len(self._slowest_lines) < self._slowest_lines_kept:
+            heapq.heappush(self._slowest_lines, (seconds, line_number, line))
+        elif self._slowest_lines and seconds > self._slowest_lines[0][0]:
+            heapq.heapreplace(self._slowest_lines, (seconds, line_number, line))
+
+    def arguments_matched(self, mnemonic: str, attempts: int, rejected: int) -> None:
+        """Count the signature attempts of a line."""
+        self.matched_lines += 1
+        self.signature_attempts += attempts
+        if rejected:
+            self.rejected_candidates[mnemonic] += rejected
+
+    def operand_cache(self, hits: int, misses: int, size: int) -> None:
+        """Record the operand cache counters."""
+        self.operand_cache_hits += hits
+        self.operand_cache_misses += misses
+        self.operand_cache_size = size
+
+    def as_dict(self) -> dict[str, Any]:
+        """Describe the statistics in a form that can be serialized to JSON."""
+        return {
+            "phases": dict(self.phases),
+            "lines": self.lines,
+            "signature_attempts": self.signature_attempts,
+            "signature_attempts_per_line": (
+                self.signature_attempts / self.matched_lines
+                if self.matched_lines
+                else 0
+            ),
+            "rejected_candidates": dict(self.rejected_candidates.most_common()),
+            "operand_cache": {
+                "hits": self.operand_cache_hits,
+                "misses": self.operand_cache_misses,
+                "hit_rate": (
+                    self.operand_cache_hits
+                    / (self.operand_cache_hits + self.operand_cache_misses)
+                    if self.operand_cache_hits + self.operand_cache_misses
+                    else 0
+                ),
+                "size": self.operand_cache_size,
+            },
+            "slowest_lines": [
+                {"line_number": line_number, "line": line, "seconds": seconds}
+                for seconds, line_number, line in sorted(
+                    self._slowest_lines, reverse=True
+                )
+            ],
+        }
+
+
+class _TimedLexer(Lexer):
+    """A lexer that reports the time spent lexing."""
+
+    def __init__(self, hooks: AssemblyHooks) -> None:
+        """Initialize the lexer."""
+        self._hooks = hooks
+
+    def lex(self, line: str) -> LexedLine:
+        """Lex a single line of source code, timing it."""
+        start = time.perf_counter()
+        try:
+            return super().lex(line)
+        finally:
+            self._hooks.phase("lex", time.perf_counter() - start)
+
+
+class InstrumentedParser(Parser):
+    """A parser that reports its phases and lines to hooks.
+
+    Kept apart from Parser so that parsing pays nothing for the
+    instrumentation unless it is asked for.
+    """
+
+    def __init__(self, *args: Any, hooks: AssemblyHooks, **kwargs: Any) -> None:
+        """Initialize the parser.
+
+        Args:
+            hooks: The hooks to report to.
+            *args, **kwargs: The arguments of Parser.
+        """
+        super().__init__(*args, **kwargs)
+        self._hooks = hooks
+        self._lexer = _TimedLexer(hooks)
+        self._line_number = 0
+
+    def _parse_line(self, line: str) -> None:
+        """Parse a single line of source code, timing it."""
+        start = time.perf_counter()
+        try:
+            super()._parse_line(line)
+        finally:
+            self._hooks.line(self._line_number, line, time.perf_counter() - start)
+            self._line_number += 1
+
+    def _parse_arguments(
+        self, command: str, line: str, offset: int
+    ) -> tuple[Argument, ...]:
+        """Parse the arguments of a command, counting the attempts."""
+        self._argument_parser.last_scans = {}
+        start = time.perf_counter()
+        try:
+            return super()._parse_arguments(command, line, offset)
+        finally:
+            self._hooks.phase("match", time.perf_counter() - start)
+            scans = self._argument_parser.last_scans
+            self._hooks.arguments_matched(
+                command,
+                len(scans),
+                sum(argument is None for argument in scans.values()),
+            )
+
+    def _encode_command(self, command: Command) -> Fragment:
+        """Encode a command for the current section, timing it."""
+        start = time.perf_counter()
+        try:
+            return super()._encode_command(command)
+        finally:
+            self._hooks.phase("encode", time.perf_counter() - start)
+
+    def _apply_line(self, parsed: ParsedLine) -> None:
+        """Add a parsed line to the sections, timing it."""
+        start = time.perf_counter()
+        try:
+            super()._apply_line(parsed)
+        finally:
+            self._hooks.phase("place", time.perf_counter() - start)
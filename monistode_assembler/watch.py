@@ -0,0 +1,92 @@
+"""Re-assemble a source file whenever it changes."""
+import os
+import time
+from typing import Callable
+
+from .assemble import Assembler
+from .compiled import CompiledConfiguration
+from .exceptions import AssemblerError
+from .parse import LineCache
+
+
+class IncrementalAssembler:
+    """An assembler that re-encodes only the lines that changed.
+
+    The encoding of a line only depends on its text and its section, so
+    every encoded line is kept between runs and unchanged lines are only
+    placed again, which moves their labels and relocations to their new
+    offsets.
+    """
+
+    def __init__(self, compiled: CompiledConfiguration) -> None:
+        """Initialize the assembler.
+
+        Args:
+            compiled: The compiled configuration to assemble with.
+        """
+        self._line_cache = LineCache()
+        self._assembler = Assembler.from_compiled(compiled, self._line_cache)
+        self.reused_lines = 0
+        self.encoded_lines = 0
+
+    def assemble(self, source: str, directory: str = "") -> bytes:
+        """Assemble a new version of the source.
+
+        Args:
+            source: The source code.
+            directory: The directory of the source file, which the paths in
+                it are relative to; defaults to the working directory.
+        """
+        self._line_cache.rotate()
+        try:
+            return self._assembler.assemble(source, directory)
+        finally:
+            self.reused_lines = self._line_cache.hits
+            self.encoded_lines = self._line_cache.misses
+
+
+def watch(
+    compiled: CompiledConfiguration,
+    source: str,
+    destination: str,
+    report: Callable[[str], None],
+    interval: float = 0.1,
+) -> None:
+    """Re-assemble a source file into an object file whenever it is modified.
+
+    Runs until interrupted. Errors are reported and the previous
+    object file is kept until the source assembles again.
+
+    Args:
+        compiled: The compiled configuration to assemble with.
+        source: The path of the source file.
+        destination: The path of the object file.
+        report: A callback for status and error messages.
+        interval: The time between checks for modifications, in seconds.
+    """
+    assembler = IncrementalAssembler(compiled)
+    last_modified: int | None = None
+    while True:
+        try:
+            modified = os.stat(source).st_mtime_ns
+        except OSError as error:
+            report(str(error))
+            modified = None
+        if modified is not None and modified != last_modified:
+            last_modified = modified
+            start = time.perf_counter()
+            try:
+                with open(source) as file:
+                    assembled = assembler.assemble(file.read(), os.path.dirname(source))
+                with open(destination, "wb") as file:
+                    file.write(assembled)
+            except (AssemblerError, OSError) as error:
+                report(str(error))
+            else:
+                report(
+                    f"Assembled {source} in "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms "
+                    f"({assembler.encoded_lines} lines encoded, "
+                    f"{assembler.reused_lines} reused)"
+                )
+        time.sleep(interval)
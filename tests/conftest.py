@@ -0,0 +1,26 @@
+"""Fixtures shared by the tests."""
+import os
+
+import pytest
+
+from monistode_assembler.compiled import CompiledConfiguration
+
+CONFIGURATIONS = os.path.join(os.path.dirname(__file__), "configurations")
+
+
+def load_configuration(name: str) -> CompiledConfiguration:
+    """Compile one of the configurations bundled with the tests."""
+    with open(os.path.join(CONFIGURATIONS, f"{name}.yaml")) as file:
+        return CompiledConfiguration.from_yaml(file.read())
+
+
+@pytest.fixture(scope="session")
+def isa8() -> CompiledConfiguration:
+    """An ISA with 8-bit bytes and the opcode in the first byte."""
+    return load_configuration("isa8")
+
+
+@pytest.fixture(scope="session")
+def isa6() -> CompiledConfiguration:
+    """An ISA with 6-bit bytes and an argument before the opcode."""
+    return load_configuration("isa6")
@@ -0,0 +1,20 @@
+"""The benchmark suite, run at a size small enough for the tests."""
+from monistode_assembler.benchmark import compare, run_benchmarks
+from monistode_assembler.compiled import CompiledConfiguration
+
+
+def test_benchmarks_round_trip(isa8: CompiledConfiguration) -> None:
+    # Only outputs are checked; timing budgets are left to the benchmark command
+    report = run_benchmarks(isa8, "isa8", sizes=(100,), repeat=1)
+    assert report.failures == []
+    assert report.skipped_commands == []
+    assert report.measurements
+
+
+def test_compare_allows_noise_below_the_threshold() -> None:
+    baseline = {"results": {"fast": {"rate": 100.0, "unit": "lines"}}}
+    assert not compare(baseline, {"results": {"fast": {"rate": 80.0, "unit": "lines"}}})
+    (regression,) = compare(
+        baseline, {"results": {"fast": {"rate": 60.0, "unit": "lines"}}}
+    )
+    assert regression.name == "fast"
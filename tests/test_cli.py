@@ -0,0 +1,8 @@
+"""The start-up of the command line interface."""
+from monistode_assembler.benchmark import CLI_MODULE, eager_imports, import_time
+
+
+def test_cli_imports_lazily() -> None:
+    _, imported = import_time(CLI_MODULE)
+    assert CLI_MODULE in imported
+    assert eager_imports(imported) == []
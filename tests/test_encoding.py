@@ -0,0 +1,124 @@
+"""The bytes and relocations the assembler encodes programs into."""
+from monistode_binutils_shared import ObjectManager
+
+from monistode_assembler.assemble import Assembler
+from monistode_assembler.compiled import CompiledConfiguration
+
+PROGRAM_8 = """
+.text
+start:
+    nop
+    mov %r1, %r2   # comment
+    mov %r3, $42
+    mov %r3, $31
+    load %r5, [%r6]
+    load %r5, [%r7 + 12]
+    load %r5, [%r7 + msg]
+    lea %r1, %sp + 8
+    lea %r1, %fp + msg + 2
+loop:
+    jmp loop
+    call start
+    push %r9
+    ld 10, msg
+    ld msg2, 32
+    addi $msg
+    # full comment line
+    halt
+.data
+msg:
+    ascii "hello\\n"
+msg2:
+    asciiz "world"
+"""
+
+PROGRAM_6 = """
+.text
+top:
+    nop
+    mov %a, %b
+    li %c, %d, $100
+    jmp top
+    ld %a, %b, %c + 5
+end:
+    br end
+    br top
+.data
+x:
+    asciiz "abc"
+"""
+
+
+def sections(
+    compiled: CompiledConfiguration, source: str
+) -> dict[str, tuple[list[int], list[tuple], list[tuple]]]:
+    """Assemble a program and describe its text and data sections.
+
+    Each section is described by its bytes, its relocations as tuples of
+    their offset, symbol, size, offset within the value and whether they
+    are relative, and its symbols as tuples of their offset and name.
+    """
+    binary = Assembler.from_compiled(compiled).assemble(source)
+    return {
+        section.name: (
+            list(section.data),
+            [
+                (
+                    relocation.location.offset,
+                    relocation.symbol.name,
+                    relocation.size,
+                    relocation.offset,
+                    relocation.relative,
+                )
+                for relocation in section.relocations
+            ],
+            [(symbol.location.offset, symbol.name) for symbol in section.symbols],
+        )
+        for section in ObjectManager.from_bytes(binary)._sections
+        if section.name in ("text", "data")
+    }
+
+
+def test_encode_8_bit(isa8: CompiledConfiguration) -> None:
+    text, data = sections(isa8, PROGRAM_8).values()
+    assert text == (
+        [0, 2, 18, 3, 48, 42, 3, 48, 31, 4, 86, 5, 87, 0, 12, 5, 87, 0, 0, 6, 16]
+        + [0, 8, 6, 17, 0, 2, 7, 255, 254, 8, 0, 0, 9, 9, 10, 0, 10, 0, 0, 10]
+        + [0, 0, 0, 32, 11, 0, 0, 1],
+        [
+            (16, "msg", 16, 8, 0),
+            (24, "msg", 16, 8, 0),
+            (28, "loop", 16, 0, 1),
+            (31, "start", 16, 0, 0),
+            (38, "msg", 16, 0, 0),
+            (41, "msg2", 16, 0, 0),
+            (46, "msg", 16, 0, 0),
+        ],
+        [(0, "start"), (27, "loop")],
+    )
+    assert data == (
+        list(b"hello\nworld\0"),
+        [],
+        [(0, "msg"), (6, "msg2")],
+    )
+
+
+def test_encode_6_bit(isa6: CompiledConfiguration) -> None:
+    text, data = sections(isa6, PROGRAM_6).values()
+    assert text == (
+        [0, 0, 1, 8, 4, 195, 6, 64, 4, 0, 0, 69, 64, 80, 6, 255, 253, 0, 27, 255]
+        + [244],
+        [(12, "top", 16, 0, 0), (20, "end", 16, 0, 1), (25, "top", 16, 0, 1)],
+        [(0, "top"), (18, "end")],
+    )
+    assert data == (list(b"abc\0"), [], [(0, "x")])
+
+
+def test_encode_in_parallel(
+    isa8: CompiledConfiguration, isa6: CompiledConfiguration
+) -> None:
+    for compiled, source in ((isa8, PROGRAM_8), (isa6, PROGRAM_6)):
+        assembler = Assembler.from_compiled(compiled)
+        assert assembler.assemble_parallel(
+            source, processes=2, chunk_lines=4
+        ) == assembler.assemble(source)
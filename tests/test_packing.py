@@ -0,0 +1,23 @@
+"""Packing bytes of any width, and unpacking them lazily."""
+import random
+
+from monistode_assembler.packing import PackedBytes, lazy_bytes, pack_bytes
+
+
+def test_packed_bytes_slices_match_unpacked() -> None:
+    generator = random.Random(0)
+    for byte in (3, 6, 12):
+        values = [
+            generator.randrange(1 << byte) for _ in range(PackedBytes.WINDOW * 2 + 5)
+        ]
+        packed = PackedBytes(pack_bytes(values, byte), byte, len(values))
+        assert len(packed) == len(values)
+        assert packed[-1] == values[-1]
+        for _ in range(200):
+            start = generator.randrange(len(values) + 2)
+            stop = generator.randrange(len(values) + 2)
+            assert packed[start:stop] == values[start:stop]
+
+
+def test_octets_are_viewed_in_place() -> None:
+    assert list(lazy_bytes(b"\x01\x02\x03", 8, 2)) == [1, 2]